@@ -1,6 +1,5 @@
 """Configuration module."""
 
-from config.settings import settings
-
-__all__ = ["settings"]
+from config.settings import Settings, get_settings
 
+__all__ = ["Settings", "get_settings"]
@@ -79,7 +79,7 @@ print_success "Environment configured (using .env.production)"
 # Step 6: Test database connection
 print_step "Testing database connection..."
 python3 << 'PYTHON'
-from config.settings import settings
+from config.settings import get_settings
 from src.database.repository import DatabaseRepository
 
 try:
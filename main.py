@@ -3,7 +3,7 @@
 
 import argparse
 import sys
-from typing import Optional
+from typing import Callable, Dict
 
 from src.bot.trading_bot import TradingBot
 from src.utils import setup_logger
@@ -16,7 +16,7 @@ def main():
     parser = argparse.ArgumentParser(description="Trump Trading Bot")
     parser.add_argument(
         "command",
-        choices=["test", "start", "stop", "status", "close-positions", "position-status"],
+        choices=COMMANDS,
         help="Command to execute"
     )
     parser.add_argument(
@@ -36,21 +36,7 @@ def main():
     bot = TradingBot()
     
     try:
-        if args.command == "test":
-            test_connections(bot)
-        elif args.command == "start":
-            start_bot(bot)
-        elif args.command == "stop":
-            stop_bot(bot)
-        elif args.command == "status":
-            show_status(bot)
-        elif args.command == "close-positions":
-            close_positions(bot)
-        elif args.command == "position-status":
-            send_position_status(bot)
-        else:
-            logger.error(f"Unknown command: {args.command}")
-            sys.exit(1)
+        COMMANDS[args.command](bot)
             
     except KeyboardInterrupt:
         logger.info("Operation cancelled by user")
@@ -199,5 +185,16 @@ def send_position_status(bot: TradingBot) -> None:
     logger.info("Position status sent successfully.")
 
 
+# Command name -> handler; also the argparse choices
+COMMANDS: Dict[str, Callable[[TradingBot], None]] = {
+    "test": test_connections,
+    "start": start_bot,
+    "stop": stop_bot,
+    "status": show_status,
+    "close-positions": close_positions,
+    "position-status": send_position_status,
+}
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,47 +1,128 @@
 """Sentiment analysis using Anthropic Claude API."""
 
+import asyncio
 import json
+import re
 import time
-from datetime import datetime, timezone
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 
 try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except (ImportError, ModuleNotFoundError, TypeError):
-    # Fallback for Python 3.13+ compatibility
-    anthropic = None
-    ANTHROPIC_AVAILABLE = False
-
-from config.settings import settings
-from src.database.repository import DatabaseRepository
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+from sqlalchemy import case, func
+
+from config.settings import get_settings
+from src.database.repository import get_repository
 from src.database.models import SentimentAnalysis, SocialMediaPost
-from src.utils import setup_logger
+from src.utils import hash_content, setup_logger
 
 logger = setup_logger(__name__)
 
+# Fallback patterns for pulling a score out of a non-JSON reply
+_RE_SCORE_SLASH10 = re.compile(r'(\d+)/10')
+_RE_SCORE_PREFIX = re.compile(r'score[:\s]*(\d+)', re.IGNORECASE)
+_RE_SCORE_ANY = re.compile(r'\b([0-9]|10)\b')
+
+# Connection pool shared by every request to the Claude API
+HTTP_MAX_CONNECTIONS = 16
+HTTP_TIMEOUT = 30.0
+
+# Seconds a get_sentiment_summary result is reused before re-querying
+SUMMARY_CACHE_TTL = 60.0
+
+# Posts shorter than this (after stripping) get a neutral score without an API call
+MIN_CONTENT_LENGTH = 5
+
+# Number of recent analyses kept in memory, keyed by content hash
+ANALYSIS_CACHE_SIZE = 256
+
+# Upper bound on concurrent Claude requests in analyze_many
+MAX_CONCURRENT_REQUESTS = 8
+
+# Sentiment prompt, split around the post content
+_PROMPT_PREFIX = """Analyze this social media post from Donald Trump for financial market sentiment.
+
+Post: \""""
+_PROMPT_SUFFIX = """"
+
+Provide:
+1. Sentiment Score (0-10): 0=extremely bearish, 5=neutral, 10=extremely bullish
+2. Reasoning: 2-3 sentences explaining your score
+
+Focus on implications for cryptocurrency markets, particularly Bitcoin.
+Consider: policy statements, economic outlook, geopolitical tensions, market confidence.
+
+Format response as JSON:
+{
+  "score": <integer 0-10>,
+  "reasoning": "<explanation>"
+}"""
+
+
+def _copy_summary(summary: Dict) -> Dict:
+    """Copy a cached sentiment summary so callers cannot alter the cache."""
+    copied = dict(summary)
+    if "scores" in copied:
+        copied["scores"] = list(copied["scores"])
+    return copied
+
 
 class SentimentAnalyzer:
     """Sentiment analysis using Claude API."""
 
     def __init__(self):
         """Initialize sentiment analyzer."""
-        if not ANTHROPIC_AVAILABLE:
-            raise ImportError("anthropic is not available. Please install it or use Python < 3.13")
+        # Imported here so CLI commands that never analyze posts skip the SDK import cost
+        try:
+            import anthropic
+            import httpx
+        except (ImportError, ModuleNotFoundError, TypeError) as e:
+            # Fallback for Python 3.13+ compatibility
+            raise ImportError("anthropic is not available. Please install it or use Python < 3.13") from e
         
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-        self.db = DatabaseRepository()
-        self.model_version = "claude-3-5-sonnet-20241022"
+        settings = get_settings()
+        self.api_key = settings.anthropic_api_key
+        self.model_version = settings.claude_model
+        # Keep-alive pools so repeated calls skip the TCP/TLS handshake
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS
+        )
+        self._http_client = httpx.Client(limits=limits, timeout=HTTP_TIMEOUT)
+        self._async_http_client = httpx.AsyncClient(limits=limits, timeout=HTTP_TIMEOUT)
+        self.client = anthropic.Anthropic(api_key=self.api_key, http_client=self._http_client)
+        self.aclient = anthropic.AsyncAnthropic(
+            api_key=self.api_key, http_client=self._async_http_client
+        )
+        # Event loop for analyze_many; the async pool stays bound to it between batches
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # hash_content(content) -> (score, reasoning), least recently used first
+        self._analysis_cache: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        # (hours, include_scores) -> (expires_at, summary)
+        self._summary_cache: Dict[Tuple[int, bool], Tuple[float, Dict]] = {}
+        self.db = get_repository()
         
         logger.info("Sentiment analyzer initialized")
 
+    def close(self) -> None:
+        """Release the pooled HTTP connections held by the Claude clients."""
+        self._http_client.close()
+        loop = self._loop or asyncio.new_event_loop()
+        loop.run_until_complete(self._async_http_client.aclose())
+        loop.close()
+        self._loop = None
+
     def test_connection(self) -> bool:
         """Test Claude API connection."""
         try:
             # Test with a simple message
             test_message = "Test connection"
             response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
+                model=self.model_version,
                 max_tokens=10,
                 messages=[{"role": "user", "content": test_message}]
             )
@@ -68,96 +149,221 @@ class SentimentAnalyzer:
         Returns:
             Tuple of (score, reasoning)
         """
+        content_key = hash_content(post_content.strip())
+        cached = self._cached_analysis(post_content, content_key)
+        if cached:
+            return cached
+        
         try:
             # Create the prompt for Claude
-            prompt = f"""Analyze this social media post from Donald Trump for financial market sentiment.
-
-Post: "{post_content}"
-
-Provide:
-1. Sentiment Score (0-10): 0=extremely bearish, 5=neutral, 10=extremely bullish
-2. Reasoning: 2-3 sentences explaining your score
-
-Focus on implications for cryptocurrency markets, particularly Bitcoin.
-Consider: policy statements, economic outlook, geopolitical tensions, market confidence.
-
-Format response as JSON:
-{{
-  "score": <integer 0-10>,
-  "reasoning": "<explanation>"
-}}"""
+            prompt = _PROMPT_PREFIX + post_content + _PROMPT_SUFFIX
 
             # Call Claude API
             response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
+                model=self.model_version,
                 max_tokens=500,
                 temperature=0.3,  # Lower temperature for more consistent results
                 messages=[{"role": "user", "content": prompt}]
             )
             
-            # Extract response text
-            response_text = response.content[0].text.strip()
-            
-            # Parse JSON response
-            try:
-                # Clean up response text (remove markdown formatting if present)
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
-                
-                result = json.loads(response_text)
-                score = int(result["score"])
-                reasoning = result["reasoning"]
-                
-                # Validate score range
-                if not 0 <= score <= 10:
-                    logger.warning(f"Score {score} out of range, clamping to 0-10")
-                    score = max(0, min(10, score))
-                
-                logger.info(f"Sentiment analysis: Score {score}/10 - {reasoning[:50]}...")
-                return score, reasoning
-                
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
-                logger.error(f"Failed to parse Claude response: {e}")
-                logger.error(f"Response text: {response_text}")
-                
-                # Fallback: try to extract score from text
-                score = self._extract_score_from_text(response_text)
-                reasoning = f"Analysis failed, extracted score: {score}"
-                return score, reasoning
+            score, reasoning, parsed = self._parse_response(response.content[0].text.strip())
+            if parsed:
+                # A guessed score from an unparseable reply is not cached, so a retry asks again
+                self._remember_analysis(content_key, (score, reasoning))
+            return score, reasoning
                 
         except Exception as e:
             logger.error(f"Error in sentiment analysis: {e}")
             # Return neutral score on error
             return 5, f"Analysis failed due to error: {str(e)}"
 
-    def _extract_score_from_text(self, text: str) -> int:
-        """Extract score from text if JSON parsing fails."""
+    async def analyze_sentiment_async(self, post_content: str, platform: str) -> Tuple[int, str]:
+        """
+        Analyze sentiment of a social media post without blocking the event loop.
+
+        Args:
+            post_content: The text content of the post
+            platform: Platform name (TWITTER or TRUTHSOCIAL)
+
+        Returns:
+            Tuple of (score, reasoning)
+        """
+        content_key = hash_content(post_content.strip())
+        cached = self._quick_analysis(post_content, content_key)
+        if cached:
+            return cached
+        
+        # Database cache reads and writes are blocking, so they run in a worker
+        # thread instead of stalling other analyses on the event loop
+        stored = await asyncio.to_thread(self._stored_analysis, content_key)
+        if stored:
+            self._remember_in_memory(content_key, stored)
+            return stored
+        
         try:
-            # Look for patterns like "score: 8" or "8/10"
-            import re
+            prompt = _PROMPT_PREFIX + post_content + _PROMPT_SUFFIX
+
+            response = await self.aclient.messages.create(
+                model=self.model_version,
+                max_tokens=500,
+                temperature=0.3,
+                messages=[{"role": "user", "content": prompt}]
+            )
             
-            # Try to find number followed by /10
-            match = re.search(r'(\d+)/10', text)
-            if match:
-                return int(match.group(1))
+            score, reasoning, parsed = self._parse_response(response.content[0].text.strip())
+            if parsed:
+                # A guessed score from an unparseable reply is not cached, so a retry asks again
+                self._remember_in_memory(content_key, (score, reasoning))
+                await asyncio.to_thread(self._persist_analysis, content_key, (score, reasoning))
+            return score, reasoning
+                
+        except Exception as e:
+            logger.error(f"Error in sentiment analysis: {e}")
+            return 5, f"Analysis failed due to error: {str(e)}"
+
+    def analyze_many(self, posts: List[Dict]) -> List[Tuple[int, str]]:
+        """
+        Analyze several posts concurrently.
+
+        At most MAX_CONCURRENT_REQUESTS calls are in flight at once, so a
+        batch takes roughly ceil(N / limit) round-trips instead of N.
+
+        Args:
+            posts: Post dicts with "content" and "platform" keys
+
+        Returns:
+            List of (score, reasoning) tuples in the same order as posts
+        """
+        if not posts:
+            return []
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self._analyze_many_async(posts))
+
+    async def _analyze_many_async(self, posts: List[Dict]) -> List[Tuple[int, str]]:
+        """Run analyze_sentiment_async over posts with bounded concurrency."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def analyze(post: Dict) -> Tuple[int, str]:
+            async with semaphore:
+                return await self.analyze_sentiment_async(post["content"], post["platform"])
+
+        return list(await asyncio.gather(*(analyze(post) for post in posts)))
+
+    def _cached_analysis(self, post_content: str, content_key: str) -> Optional[Tuple[int, str]]:
+        """
+        Return a result that does not need a Claude call, if there is one.
+
+        Near-empty posts score neutral, and content analyzed before is
+        served from the in-memory cache or, failing that, the database cache.
+
+        Args:
+            post_content: The text content of the post
+            content_key: hash_content of the stripped content, keying both caches
+        """
+        cached = self._quick_analysis(post_content, content_key)
+        if cached:
+            return cached
+        
+        cached = self._stored_analysis(content_key)
+        if cached:
+            self._remember_in_memory(content_key, cached)
+        return cached
+
+    def _quick_analysis(self, post_content: str, content_key: str) -> Optional[Tuple[int, str]]:
+        """Return the neutral result for near-empty posts, or an in-memory cache hit."""
+        if len(post_content.strip()) < MIN_CONTENT_LENGTH:
+            logger.info("Post content too short for analysis - returning neutral score")
+            return 5, "Content too short for analysis"
+        
+        cached = self._analysis_cache.get(content_key)
+        if cached:
+            self._analysis_cache.move_to_end(content_key)
+            logger.debug("Sentiment served from in-memory cache")
+        return cached
+
+    def _stored_analysis(self, content_key: str) -> Optional[Tuple[int, str]]:
+        """Look up a result in the database cache (blocking)."""
+        try:
+            stored = self.db.get_cached_sentiment(content_key, self.model_version)
+        except Exception as e:
+            logger.warning(f"Could not read sentiment cache: {e}")
+            return None
+        
+        if not stored:
+            return None
+        logger.info("Sentiment served from database cache")
+        return stored.score, stored.reasoning
+
+    def _remember_analysis(self, content_key: str, result: Tuple[int, str]) -> None:
+        """Cache an analysis result in memory and in the database."""
+        self._remember_in_memory(content_key, result)
+        self._persist_analysis(content_key, result)
+
+    def _persist_analysis(self, content_key: str, result: Tuple[int, str]) -> None:
+        """Write an analysis result to the database cache (blocking)."""
+        try:
+            self.db.cache_sentiment(content_key, self.model_version, *result)
+        except Exception as e:
+            logger.warning(f"Could not write sentiment cache: {e}")
+
+    def _remember_in_memory(self, key: str, result: Tuple[int, str]) -> None:
+        """Cache a result in memory, evicting the least recently used entry when full."""
+        self._analysis_cache[key] = result
+        self._analysis_cache.move_to_end(key)
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+    def _parse_response(self, response_text: str) -> Tuple[int, str, bool]:
+        """
+        Parse Claude's reply into a score and reasoning.
+
+        Args:
+            response_text: Raw text of the model response
+
+        Returns:
+            Tuple of (score, reasoning, parsed), where parsed is False when
+            the reply was not valid JSON and the score was guessed from text
+        """
+        try:
+            # Clean up response text (remove markdown formatting if present)
+            _, fence, body = response_text.partition("```json")
+            if not fence:
+                _, fence, body = response_text.partition("```")
+            if fence:
+                response_text = body.partition("```")[0].strip()
             
-            # Try to find "score:" followed by number
-            match = re.search(r'score[:\s]*(\d+)', text, re.IGNORECASE)
-            if match:
-                return int(match.group(1))
+            result = _json_loads(response_text)
+            score = int(result["score"])
+            reasoning = result["reasoning"]
             
-            # Try to find any number between 0-10
-            match = re.search(r'\b([0-9]|10)\b', text)
-            if match:
-                return int(match.group(1))
+            # Validate score range
+            if not 0 <= score <= 10:
+                logger.warning(f"Score {score} out of range, clamping to 0-10")
+                score = max(0, min(10, score))
             
-            # Default to neutral
-            return 5
+            logger.info(f"Sentiment analysis: Score {score}/10 - {reasoning[:50]}...")
+            return score, reasoning, True
             
-        except Exception:
-            return 5
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            logger.error(f"Failed to parse Claude response: {e}")
+            logger.error(f"Response text: {response_text}")
+            
+            # Fallback: try to extract score from text
+            score = self._extract_score_from_text(response_text)
+            reasoning = f"Analysis failed, extracted score: {score}"
+            return score, reasoning, False
+
+    def _extract_score_from_text(self, text: str) -> int:
+        """Extract score from text if JSON parsing fails."""
+        # Look for patterns like "8/10", "score: 8", or any number between 0-10
+        for pattern in (_RE_SCORE_SLASH10, _RE_SCORE_PREFIX, _RE_SCORE_ANY):
+            match = pattern.search(text)
+            if match:
+                return int(match.group(1))
+        
+        # Default to neutral
+        return 5
 
     def process_post(self, post_data: Dict) -> Optional[Dict]:
         """
@@ -175,9 +381,10 @@ Format response as JSON:
             platform = post_data["platform"]
             
             # Check if sentiment already exists for this post
-            existing_sentiment = self.db.get_session().query(
-                SentimentAnalysis
-            ).filter_by(post_id=post_id).first()
+            with self.db.session_scope() as session:
+                existing_sentiment = session.query(
+                    SentimentAnalysis
+                ).filter_by(post_id=post_id).first()
             
             if existing_sentiment:
                 logger.debug(f"Sentiment already exists for post {post_id}")
@@ -198,6 +405,7 @@ Format response as JSON:
                 model_version=self.model_version
             )
             
+            self._summary_cache.clear()
             logger.info(f"✅ Sentiment analysis stored: {sentiment.id} - Score {score}/10")
             
             return {
@@ -212,54 +420,122 @@ Format response as JSON:
             logger.error(f"Error processing post for sentiment: {e}")
             return None
 
-    def get_sentiment_summary(self, hours: int = 24) -> Dict:
+    def process_posts(self, posts: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Process a batch of posts and perform sentiment analysis.
+
+        Existing analyses are loaded with one query and the remaining posts
+        are sent to Claude concurrently via analyze_many.
+
+        Args:
+            posts: Post data dicts from social media monitors
+
+        Returns:
+            Sentiment analysis results in the same order as posts (None on failure)
+        """
+        try:
+            existing = self.db.get_sentiments_by_post_ids([post["post_id"] for post in posts])
+            pending = [post for post in posts if post["post_id"] not in existing]
+            
+            results: Dict[int, Dict] = {
+                post_id: {
+                    "sentiment_id": sentiment.id,
+                    "score": sentiment.score,
+                    "reasoning": sentiment.reasoning
+                }
+                for post_id, sentiment in existing.items()
+            }
+            
+            # Perform sentiment analysis for posts not seen before
+            for post, (score, reasoning) in zip(pending, self.analyze_many(pending)):
+                sentiment = self.db.create_sentiment(
+                    post_id=post["post_id"],
+                    score=score,
+                    reasoning=reasoning,
+                    model_version=self.model_version
+                )
+                content = post["content"]
+                results[post["post_id"]] = {
+                    "sentiment_id": sentiment.id,
+                    "score": score,
+                    "reasoning": reasoning,
+                    "platform": post["platform"],
+                    "content": content[:100] + "..." if len(content) > 100 else content
+                }
+            
+            if pending:
+                self._summary_cache.clear()
+            logger.info(f"✅ Sentiment batch processed: {len(pending)} new, {len(existing)} existing")
+            return [results.get(post["post_id"]) for post in posts]
+            
+        except Exception as e:
+            logger.error(f"Error processing posts for sentiment: {e}")
+            return [None for _ in posts]
+
+    def get_sentiment_summary(self, hours: int = 24, include_scores: bool = True) -> Dict:
         """
         Get sentiment summary for the last N hours.
 
+        Counts and the average are aggregated in the database, so only one
+        row is returned regardless of how many posts fall in the window.
+        Results are reused for SUMMARY_CACHE_TTL seconds, or until a new
+        sentiment is stored.
+
         Args:
             hours: Number of hours to look back
+            include_scores: Also return the individual scores (one extra
+                query); pass False when only the counts are needed
 
         Returns:
-            Sentiment summary statistics
+            Sentiment summary statistics, as a copy callers may modify
         """
+        cache_key = (hours, include_scores)
+        cached = self._summary_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return _copy_summary(cached[1])
+        
         try:
-            from datetime import datetime, timedelta
-            
             cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+            score = SentimentAnalysis.score
             
             with self.db.get_session() as session:
-                sentiments = session.query(SentimentAnalysis).join(
+                window = session.query(SentimentAnalysis).join(
                     SocialMediaPost
                 ).filter(
                     SentimentAnalysis.analyzed_at >= cutoff_time
-                ).all()
+                )
+                
+                total, avg_score, bullish, bearish, neutral = window.with_entities(
+                    func.count(SentimentAnalysis.id),
+                    func.avg(score),
+                    func.sum(case((score > 5, 1), else_=0)),
+                    func.sum(case((score < 5, 1), else_=0)),
+                    func.sum(case((score == 5, 1), else_=0)),
+                ).one()
                 
-                if not sentiments:
-                    return {
+                if not total:
+                    summary = {
                         "total_posts": 0,
                         "average_score": 5.0,
                         "bullish_posts": 0,
                         "bearish_posts": 0,
-                        "neutral_posts": 0,
-                        "scores": []
+                        "neutral_posts": 0
+                    }
+                else:
+                    summary = {
+                        "total_posts": total,
+                        "average_score": round(float(avg_score), 2),
+                        "bullish_posts": int(bullish),
+                        "bearish_posts": int(bearish),
+                        "neutral_posts": int(neutral),
+                        "timeframe_hours": hours
                     }
                 
-                scores = [s.score for s in sentiments]
-                avg_score = sum(scores) / len(scores)
-                
-                bullish = len([s for s in scores if s > 5])
-                bearish = len([s for s in scores if s < 5])
-                neutral = len([s for s in scores if s == 5])
+                if include_scores:
+                    summary["scores"] = [row.score for row in window.with_entities(score)]
                 
-                return {
-                    "total_posts": len(sentiments),
-                    "average_score": round(avg_score, 2),
-                    "bullish_posts": bullish,
-                    "bearish_posts": bearish,
-                    "neutral_posts": neutral,
-                    "scores": scores,
-                    "timeframe_hours": hours
-                }
+                self._summary_cache[cache_key] = (time.monotonic() + SUMMARY_CACHE_TTL, summary)
+                return _copy_summary(summary)
                 
         except Exception as e:
             logger.error(f"Error getting sentiment summary: {e}")
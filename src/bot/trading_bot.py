@@ -1,21 +1,32 @@
 """Main trading bot orchestrator."""
 
 import asyncio
+import atexit
+import math
+import queue
+import signal
 import threading
 import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
+from config.settings import get_settings
 try:
     from src.analysis.sentiment_analyzer import SentimentAnalyzer
     SENTIMENT_AVAILABLE = True
 except (ImportError, ModuleNotFoundError, TypeError):
     SENTIMENT_AVAILABLE = False
     SentimentAnalyzer = None
-from src.database.repository import DatabaseRepository
+from src.database.models import Trade
+from src.database.repository import get_repository
 # Twitter and Truth Social via RapidAPI
 from src.monitors.twitter_rapidapi import TwitterRapidAPI as TwitterMonitor
 from src.monitors.truthsocial_rapidapi import TruthSocialRapidAPI as TruthSocialMonitor
+from src.monitors.scheduler import PollScheduler
 
 TWITTER_AVAILABLE = True
 TWITTER_METHOD = "RapidAPI (30s)"
@@ -23,17 +34,87 @@ TRUTH_SOCIAL_AVAILABLE = True
 TRUTH_SOCIAL_METHOD = "RapidAPI (30s)"
 from src.notifications.telegram_notifier import TelegramNotifier
 from src.trading.position_manager import PositionManager
-from src.utils import setup_logger
+from src.utils import calculate_pnl_percentage, format_utc_timestamp, setup_logger
 
 logger = setup_logger(__name__)
 
+# Binance income types that make up the 24h PnL figure
+INCOME_TYPES = ("REALIZED_PNL", "COMMISSION", "FUNDING_FEE")
+
+# Rows requested per futures_income_history page (Binance allows up to 1000);
+# most windows fit in one page, busier ones are paged through
+INCOME_PAGE_SIZE = 500
+
+# One day in milliseconds (Binance timestamps are epoch ms)
+DAY_MS = 24 * 60 * 60 * 1000
+
+# TTLs (seconds) for cached Binance reads shared by status/account notifications
+POSITION_PNL_CACHE_TTL = 10
+BALANCE_CACHE_TTL = 60
+PNL_24H_CACHE_TTL = 900
+TRADE_COSTS_CACHE_TTL = 15
+
+# Number of recently handled posts remembered to drop re-deliveries
+SEEN_POSTS_CACHE_SIZE = 512
+
+# Seconds flush_notifications waits for queued Telegram notifications to go out
+NOTIFICATION_DRAIN_TIMEOUT = 10.0
+
+_get_income = itemgetter('income')
+
+
+def _sum_income(history) -> float:
+    """
+    Sum the 'income' field of Binance income history entries.
+
+    Args:
+        history: Entries returned by futures_income_history
+
+    Returns:
+        Total income in USDT
+    """
+    return math.fsum(map(float, map(_get_income, history)))
+
+
+def _fetch_income(
+    client,
+    start_time: int,
+    end_time: int,
+    income_type: Optional[str] = None,
+    page_size: int = INCOME_PAGE_SIZE
+) -> Iterator[Dict]:
+    """
+    Yield Binance futures income history entries, paging through full pages.
+
+    Args:
+        client: python-binance client
+        start_time: Window start in epoch milliseconds
+        end_time: Window end in epoch milliseconds
+        income_type: Optional income type filter (all types if None)
+        page_size: Rows requested per page
+
+    Yields:
+        Income history entries in ascending time order
+    """
+    params = {"endTime": end_time, "limit": page_size}
+    if income_type:
+        params["incomeType"] = income_type
+    
+    cursor = start_time
+    while True:
+        batch = client.futures_income_history(startTime=cursor, **params)
+        yield from batch
+        if len(batch) < page_size:
+            return
+        cursor = int(batch[-1]['time']) + 1
+
 
 class TradingBot:
     """Main trading bot orchestrator."""
 
     def __init__(self):
         """Initialize the trading bot."""
-        self.db = DatabaseRepository()
+        self.db = get_repository()
         
         if SENTIMENT_AVAILABLE and SentimentAnalyzer is not None:
             try:
@@ -55,9 +136,36 @@ class TradingBot:
         self.truthsocial_monitor = TruthSocialMonitor(on_new_post=self._on_new_post)
         logger.info(f"Using Truth Social monitor: {TRUTH_SOCIAL_METHOD}")
         
+        # Both monitors poll from this one thread
+        self.poll_scheduler = PollScheduler()
+        
         # Bot state
         self.is_running = False
         self.monitoring_threads = []
+        self._stop_event = threading.Event()
+        
+        # Short-lived cache of Binance reads: key -> (expires_at, value).
+        # Filled from status-fetch workers and the notification worker.
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+        
+        # Runs the independent Binance reads behind a position status message
+        self._status_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="StatusFetch")
+        
+        # Recently handled (platform, external_id) pairs, oldest first
+        self._seen_posts: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self._seen_posts_lock = threading.Lock()
+        
+        # Telegram notifications from the post-handling path are sent by a
+        # background worker so Telegram round-trips don't delay trading
+        self._notification_queue: "queue.Queue[Tuple[Callable, tuple]]" = queue.Queue()
+        self._notification_thread = threading.Thread(
+            target=self._notification_worker, name="TelegramNotifier", daemon=True
+        )
+        self._notification_thread.start()
+        # The worker is a daemon thread, so flush before the interpreter exits
+        # (e.g. a CLI command calling sys.exit right after queuing)
+        atexit.register(self.flush_notifications)
         
         logger.info("Trading bot initialized")
 
@@ -80,6 +188,109 @@ class TradingBot:
         
         return results
 
+    def _cached(self, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """
+        Return a cached value, calling fetch() once it is older than ttl.
+
+        None results and Binance error dicts are returned but not cached.
+
+        Args:
+            key: Cache key
+            ttl: Time to live in seconds
+            fetch: Zero-argument callable producing the value
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        
+        # Fetch outside the lock so slow Binance calls don't serialize other keys
+        value = fetch()
+        if value is not None and not (isinstance(value, dict) and "error" in value):
+            with self._cache_lock:
+                self._cache[key] = (now + ttl, value)
+        return value
+
+    def _invalidate_cache(self) -> None:
+        """Drop cached Binance reads after the position changes."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _notify(self, method: Callable, *args) -> None:
+        """
+        Queue a notification call for the background worker.
+
+        Args:
+            method: Notification callable, e.g. a TelegramNotifier.notify_* method
+            *args: Arguments to call it with
+        """
+        self._notification_queue.put((method, args))
+
+    def _notification_worker(self) -> None:
+        """Send queued notifications one at a time, in order."""
+        while True:
+            method, args = self._notification_queue.get()
+            try:
+                method(*args)
+            except Exception as e:
+                logger.error(f"Error sending notification: {e}")
+            finally:
+                self._notification_queue.task_done()
+
+    def flush_notifications(self, timeout: float = NOTIFICATION_DRAIN_TIMEOUT) -> bool:
+        """
+        Wait for queued notifications to be sent.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue drained, False if the timeout expired first
+        """
+        notifications = self._notification_queue
+        deadline = time.monotonic() + timeout
+        with notifications.all_tasks_done:
+            while notifications.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"{notifications.unfinished_tasks} Telegram notification(s) not sent before shutdown")
+                    return False
+                notifications.all_tasks_done.wait(remaining)
+        return True
+
+    def _is_duplicate_post(self, post_data: Dict) -> bool:
+        """
+        Check whether a post was already handled, remembering it if not.
+
+        Polls normally arrive on the single PollScheduler thread, but that
+        thread can overlap with the _notify worker, the CLI, or a monitor
+        started on its own private scheduler, so the check-and-record is
+        still done under a lock.
+
+        Args:
+            post_data: Post data from social media monitor
+
+        Returns:
+            True if the same post was handled recently
+        """
+        external_id = post_data.get("external_id")
+        if external_id is None:
+            return False
+        
+        key = (post_data.get("platform"), str(external_id))
+        with self._seen_posts_lock:
+            if key in self._seen_posts:
+                self._seen_posts.move_to_end(key)
+                return True
+            self._seen_posts[key] = None
+            if len(self._seen_posts) > SEEN_POSTS_CACHE_SIZE:
+                self._seen_posts.popitem(last=False)
+        return False
+
     def _on_new_post(self, post_data: Dict) -> None:
         """
         Handle new social media post.
@@ -90,6 +301,11 @@ class TradingBot:
         try:
             logger.info(f"New post detected: {post_data['platform']}")
             
+            # Drop re-delivered posts before paying for sentiment analysis
+            if self._is_duplicate_post(post_data):
+                logger.info(f"Skipping already handled post: {post_data.get('external_id')}")
+                return
+            
             # Perform sentiment analysis
             if self.sentiment_analyzer:
                 sentiment_result = self.sentiment_analyzer.process_post(post_data)
@@ -99,7 +315,7 @@ class TradingBot:
                     return
                 
                 # Notify about post with combined sentiment analysis
-                self.telegram.notify_post_with_sentiment(post_data, sentiment_result)
+                self._notify(self.telegram.notify_post_with_sentiment, post_data, sentiment_result)
                 
                 # Check if we should trade
                 should_trade, reason = self.position_manager.should_trade(sentiment_result["score"])
@@ -127,35 +343,53 @@ class TradingBot:
                     sentiment_result["sentiment_id"]
                 )
                 
-                # Send position status after trade execution
                 if trade_result:
-                    self._send_position_status()
+                    # Send position status after trade execution, reusing the
+                    # trade record just created instead of re-querying it
+                    self._invalidate_cache()
+                    self._notify(self._send_position_status, trade_result.get("trade"))
+                    
+                    # Notify about trade execution
+                    self._notify(self.telegram.notify_trade_execution, trade_result)
+                    logger.info("✅ Trade executed successfully")
+                else:
+                    logger.error("❌ Trade execution failed")
             else:
                 logger.warning("Sentiment analyzer not available - skipping analysis and trading")
-                return
-            
-            if trade_result:
-                # Notify about trade execution
-                self.telegram.notify_trade_execution(trade_result)
-                logger.info("✅ Trade executed successfully")
-            else:
-                logger.error("❌ Trade execution failed")
                 
         except Exception as e:
             logger.error(f"Error handling new post: {e}")
-            self.telegram.notify_error({
+            self._notify(self.telegram.notify_error, {
                 "type": "Post Processing Error",
                 "message": str(e),
                 "component": "TradingBot"
             })
 
-    def _send_position_status(self) -> None:
-        """Send current position status to Telegram."""
+    def _send_position_status(self, open_trade: Optional[Trade] = None) -> None:
+        """
+        Send current position status to Telegram.
+
+        Args:
+            open_trade: Open trade record if the caller already has it;
+                queried from the database otherwise
+        """
         try:
-            open_trade = self.db.get_open_trade()
+            if open_trade is None:
+                open_trade = self.db.get_open_trade()
             if open_trade:
+                binance = self.position_manager.binance
+                
+                # PnL, trade costs and stop orders are independent Binance
+                # requests, so fetch them concurrently
+                pool = self._status_executor
+                pnl_future = pool.submit(
+                    self._cached, "position_pnl", POSITION_PNL_CACHE_TTL, binance.get_position_pnl
+                )
+                costs_future = pool.submit(self._compute_trade_costs, open_trade)
+                stop_orders_future = pool.submit(binance.get_stop_orders)
+                
                 # Get actual PnL from Binance (includes leverage and fees)
-                binance_pnl = self.position_manager.binance.get_position_pnl()
+                binance_pnl = pnl_future.result()
                 
                 if binance_pnl:
                     # Use comprehensive Binance data
@@ -172,7 +406,6 @@ class TradingBot:
                 else:
                     # Fallback to calculation if Binance data unavailable
                     current_price = self.position_manager.binance.get_current_price()
-                    from src.utils.helpers import calculate_pnl_percentage
                     pnl_percentage = calculate_pnl_percentage(
                         open_trade.entry_price,
                         current_price,
@@ -189,39 +422,11 @@ class TradingBot:
                     margin_ratio = 0
                     margin_type = "CROSS"
                 
-                # Calculate fees - try to get actual fees first, fallback to estimate
-                actual_fees = 0.0
-                if open_trade.entry_order_id:
-                    actual_fees = self.position_manager.binance.get_order_fees(open_trade.entry_order_id) or 0.0
-                
-                if actual_fees > 0:
-                    fees = actual_fees
-                else:
-                    # Fallback to estimate (Binance USDT-M futures: 0.05% taker fee)
-                    fees = open_trade.notional_value * 0.0005
-                
-                # Format created_at timestamp
-                created_at_str = open_trade.opened_at.strftime('%Y-%m-%d %H:%M:%S UTC') if hasattr(open_trade, 'opened_at') else "Unknown"
-                
-                # Get funding fees since position opened
-                funding_fee = 0.0
-                try:
-                    import time
-                    start_time = int(open_trade.opened_at.timestamp() * 1000) if hasattr(open_trade, 'opened_at') else None
-                    if start_time:
-                        end_time = int(time.time() * 1000)
-                        funding_history = self.position_manager.binance.client.futures_income_history(
-                            incomeType="FUNDING_FEE",
-                            startTime=start_time,
-                            endTime=end_time,
-                            limit=1000
-                        )
-                        funding_fee = sum(float(entry['income']) for entry in funding_history)
-                except Exception as e:
-                    logger.warning(f"Could not fetch funding fees: {e}")
+                # Fees, funding fees since the position opened, and open time
+                fees, funding_fee, created_at_str = costs_future.result()
                 
                 # Get ACTUAL stop orders from Binance
-                stop_orders = self.position_manager.binance.get_stop_orders()
+                stop_orders = stop_orders_future.result()
                 
                 # Use actual stop-loss price if order exists, otherwise use database value
                 if stop_orders["stop_loss"]:
@@ -276,19 +481,105 @@ class TradingBot:
         except Exception as e:
             logger.error(f"Error sending position status: {e}")
 
+    def _compute_trade_costs(self, trade: Trade) -> Tuple[float, float, str]:
+        """
+        Get the fees, funding fee and formatted open time for a trade.
+
+        Results are cached per trade for TRADE_COSTS_CACHE_TTL so a status
+        update and a close notification for the same trade share Binance calls.
+
+        Args:
+            trade: Trade record
+
+        Returns:
+            Tuple of (fees, funding_fee, opened_at_str)
+        """
+        def fetch() -> Tuple[float, float, str]:
+            # Sequential on purpose: this usually runs on a status-executor
+            # worker already, alongside the other status reads
+            binance = self.position_manager.binance
+            
+            # Use actual fees when available, otherwise estimate
+            # (Binance USDT-M futures: 0.05% taker fee)
+            actual_fees = (binance.get_order_fees(trade.entry_order_id) or 0.0) if trade.entry_order_id else 0.0
+            fees = actual_fees if actual_fees > 0 else trade.notional_value * 0.0005
+            funding_fee = self._get_funding_fee(trade)
+            
+            opened_at_str = format_utc_timestamp(trade.opened_at) if hasattr(trade, 'opened_at') else "Unknown"
+            return fees, funding_fee, opened_at_str
+        
+        return self._cached(f"trade_costs:{trade.id}", TRADE_COSTS_CACHE_TTL, fetch)
+
+    def _get_funding_fee(self, open_trade) -> float:
+        """
+        Sum funding fees paid since a position was opened.
+
+        Args:
+            open_trade: Open trade record
+
+        Returns:
+            Total funding fee in USDT (0.0 if unavailable)
+        """
+        try:
+            start_time = open_trade.opened_at_ms if hasattr(open_trade, 'opened_at') else None
+            if not start_time:
+                return 0.0
+            end_time = time.time_ns() // 1_000_000
+            funding_history = _fetch_income(
+                self.position_manager.binance.client, start_time, end_time, "FUNDING_FEE"
+            )
+            return _sum_income(funding_history)
+        except Exception as e:
+            logger.warning(f"Could not fetch funding fees: {e}")
+            return 0.0
+
+    def _fetch_pnl_24h(self) -> float:
+        """
+        Fetch the last 24h PnL from Binance income history.
+
+        Returns:
+            Realized PnL plus commissions and funding fees over the last 24h
+
+        Raises:
+            Exception: If any Binance income history request fails
+        """
+        # Current time and 24 hours ago, in epoch milliseconds
+        end_time = time.time_ns() // 1_000_000
+        start_time = end_time - DAY_MS
+        
+        # One unfiltered request covers all income types; partition client-side
+        client = self.position_manager.binance.client
+        income_by_type = {income_type: [] for income_type in INCOME_TYPES}
+        for entry in _fetch_income(client, start_time, end_time):
+            entries = income_by_type.get(entry.get('incomeType'))
+            if entries is not None:
+                entries.append(entry)
+        
+        # Sum all realized PnL, commissions, and funding fees
+        realized_pnl_sum = _sum_income(income_by_type["REALIZED_PNL"])
+        commission_24h = _sum_income(income_by_type["COMMISSION"])
+        funding_24h = _sum_income(income_by_type["FUNDING_FEE"])
+        
+        # Total = PnL + Commission + Funding (can be positive or negative)
+        pnl_24h = realized_pnl_sum + commission_24h + funding_24h
+        
+        logger.info(f"24h PnL from Binance: PnL={realized_pnl_sum:.2f}, Commission={commission_24h:.2f}, Funding={funding_24h:.2f}, Total={pnl_24h:.2f}")
+        return pnl_24h
+
     def _get_account_info(self) -> Dict:
         """Get account information for startup notification."""
         try:
             # Get account balance and details from Binance
-            account_info = self.position_manager.binance.get_account_balance()
+            account_info = self._cached(
+                "account_balance", BALANCE_CACHE_TTL, self.position_manager.binance.get_account_balance
+            )
             balance = account_info.get("total_balance", 0)
             available_balance = account_info.get("available_balance", 0)
             margin_balance = account_info.get("margin_balance", 0)
             unrealized_pnl = account_info.get("unrealized_pnl", 0)
             
             # Get trading mode
-            from config.settings import settings
-            trading_mode = "LIVE" if not settings.binance_testnet else "TESTNET"
+            trading_mode = "LIVE" if not get_settings().binance_testnet else "TESTNET"
             
             # Get open positions count
             open_trade = self.db.get_open_trade()
@@ -300,71 +591,24 @@ class TradingBot:
             # Calculate actual 24h PnL from Binance income history (includes all fees)
             # This is more accurate than database as it includes entry/exit fees
             try:
-                from datetime import datetime, timedelta
-                import time
-                
-                # Get current timestamp
-                end_time = int(time.time() * 1000)
-                # Get 24 hours ago timestamp
-                start_time = int((datetime.now(timezone.utc) - timedelta(hours=24)).timestamp() * 1000)
-                
-                # Fetch REALIZED_PNL from Binance income history
-                realized_pnl = self.position_manager.binance.client.futures_income_history(
-                    incomeType="REALIZED_PNL",
-                    startTime=start_time,
-                    endTime=end_time,
-                    limit=1000
-                )
-                
-                # Fetch COMMISSION from Binance income history
-                commissions = self.position_manager.binance.client.futures_income_history(
-                    incomeType="COMMISSION",
-                    startTime=start_time,
-                    endTime=end_time,
-                    limit=1000
-                )
-                
-                # Fetch FUNDING_FEE from Binance income history
-                funding_fees = self.position_manager.binance.client.futures_income_history(
-                    incomeType="FUNDING_FEE",
-                    startTime=start_time,
-                    endTime=end_time,
-                    limit=1000
-                )
-                
-                # Sum all realized PnL, commissions, and funding fees
-                realized_pnl_sum = sum(float(entry['income']) for entry in realized_pnl)
-                commission_24h = sum(float(entry['income']) for entry in commissions)
-                funding_24h = sum(float(entry['income']) for entry in funding_fees)
-                
-                # Total = PnL + Commission + Funding (can be positive or negative)
-                pnl_24h = realized_pnl_sum + commission_24h + funding_24h
-                
-                logger.info(f"24h PnL from Binance: PnL={realized_pnl_sum:.2f}, Commission={commission_24h:.2f}, Funding={funding_24h:.2f}, Total={pnl_24h:.2f}")
+                pnl_24h = self._cached("pnl_24h", PNL_24H_CACHE_TTL, self._fetch_pnl_24h)
             except Exception as e:
                 logger.warning(f"Could not fetch 24h PnL from Binance, falling back to database: {e}")
                 # Fallback to database
-                pnl_24h = 0
-                trades_24h = self.db.get_trades_last_24h()
-                for trade in trades_24h:
-                    if trade.pnl_usd is not None:
-                        pnl_24h += trade.pnl_usd
+                pnl_24h = self.db.get_pnl_sum_last_24h()
             
-            # Get rate limit info from monitors
-            # Always fetch fresh rate limits by triggering test connections
+            # Get rate limit info from monitors. Each monitor records the
+            # rate-limit headers of its latest request, and start_monitoring
+            # probes every service just before this, so no extra calls are needed.
             twitter_rate_limit = {}
             truthsocial_rate_limit = {}
             
             if self.twitter_monitor:
-                logger.info("Fetching fresh Twitter rate limits...")
-                self.twitter_monitor.test_connection()
                 twitter_status = self.twitter_monitor.get_monitoring_status()
                 twitter_rate_limit = twitter_status.get("rate_limit", {})
                 logger.info(f"Twitter rate limit for startup: {twitter_rate_limit}")
             
             if self.truthsocial_monitor:
-                logger.info("Fetching fresh Truth Social rate limits...")
-                self.truthsocial_monitor.test_connection()
                 truthsocial_status = self.truthsocial_monitor.get_monitoring_status()
                 truthsocial_rate_limit = truthsocial_status.get("rate_limit", {})
                 logger.info(f"Truth Social rate limit for startup: {truthsocial_rate_limit}")
@@ -425,7 +669,6 @@ class TradingBot:
         # Send startup notification with account info
         try:
             # Wait a moment for APIs to fully initialize
-            import time
             time.sleep(2)
             account_info = self._get_account_info()
             self.telegram.notify_startup(account_info)
@@ -437,11 +680,14 @@ class TradingBot:
         
         # Start monitoring threads
         self.is_running = True
+        self._stop_event.clear()
+        self.poll_scheduler.start()
         
         # Twitter monitoring
         if self.twitter_monitor:
             twitter_thread = threading.Thread(
                 target=self.twitter_monitor.start_monitoring,
+                args=(self.poll_scheduler,),
                 name="TwitterMonitor"
             )
             twitter_thread.daemon = True
@@ -455,6 +701,7 @@ class TradingBot:
         if self.truthsocial_monitor:
             truthsocial_thread = threading.Thread(
                 target=self.truthsocial_monitor.start_monitoring,
+                args=(self.poll_scheduler,),
                 name="TruthSocialMonitor"
             )
             truthsocial_thread.daemon = True
@@ -487,8 +734,13 @@ class TradingBot:
                 thread.join(timeout=5)
         
         self.monitoring_threads.clear()
+        self.poll_scheduler.stop()
         self.is_running = False
         
+        # Let pending Telegram notifications go out before shutdown
+        self.flush_notifications()
+        self._stop_event.set()
+        
         logger.info("✅ Social media monitoring stopped")
 
     def get_status(self) -> Dict:
@@ -547,32 +799,7 @@ class TradingBot:
                 # Get the closed trade data for notification
                 closed_trade = self.db.get_trade_by_id(open_trade.id)
                 if closed_trade and not closed_trade.is_open:
-                    # Get fees - try actual fees first, fallback to estimate
-                    actual_fees = 0.0
-                    if closed_trade.entry_order_id:
-                        actual_fees = self.position_manager.binance.get_order_fees(closed_trade.entry_order_id) or 0.0
-                    
-                    fees = actual_fees if actual_fees > 0 else (closed_trade.notional_value * 0.0005)
-                    
-                    # Get funding fees since position opened
-                    funding_fee = 0.0
-                    try:
-                        import time
-                        start_time = int(closed_trade.opened_at.timestamp() * 1000) if hasattr(closed_trade, 'opened_at') else None
-                        if start_time:
-                            end_time = int(time.time() * 1000)
-                            funding_history = self.position_manager.binance.client.futures_income_history(
-                                incomeType="FUNDING_FEE",
-                                startTime=start_time,
-                                endTime=end_time,
-                                limit=1000
-                            )
-                            funding_fee = sum(float(entry['income']) for entry in funding_history)
-                    except Exception as e:
-                        logger.warning(f"Could not fetch funding fees: {e}")
-                    
-                    # Format opened_at timestamp
-                    opened_at_str = closed_trade.opened_at.strftime('%Y-%m-%d %H:%M:%S UTC') if hasattr(closed_trade, 'opened_at') else "Unknown"
+                    fees, funding_fee, opened_at_str = self._compute_trade_costs(closed_trade)
                     
                     # Send comprehensive close notification
                     close_data = {
@@ -591,8 +818,13 @@ class TradingBot:
                         "funding_fee": funding_fee,
                         "opened_at": opened_at_str
                     }
+                    # Sent inline rather than queued: the close-positions CLI
+                    # command exits as soon as this returns
                     self.telegram.notify_position_closed(close_data)
                 
+                # Invalidate after the close notification so it can reuse the
+                # trade costs fetched for the last status message
+                self._invalidate_cache()
                 return True, ""
             else:
                 error_msg = "Failed to close position on exchange - check position_manager logs"
@@ -600,7 +832,6 @@ class TradingBot:
                 return False, error_msg
                 
         except Exception as e:
-            import traceback
             error_msg = f"{type(e).__name__}: {str(e)}"
             logger.error(f"Error closing positions: {error_msg}")
             logger.error(traceback.format_exc())
@@ -609,11 +840,14 @@ class TradingBot:
     def run_forever(self) -> None:
         """Run the bot forever (for production use)."""
         try:
+            # Treat SIGTERM (e.g. docker stop) like Ctrl+C
+            signal.signal(signal.SIGTERM, lambda *_: self._stop_event.set())
+            
             self.start_monitoring()
             
-            # Keep the main thread alive
-            while self.is_running:
-                time.sleep(1)
+            # Block the main thread until stop_monitoring() or a signal sets the event
+            if self.is_running:
+                self._stop_event.wait()
                 
         except KeyboardInterrupt:
             logger.info("Bot stopped by user")
@@ -621,4 +855,6 @@ class TradingBot:
             logger.error(f"Bot error: {e}")
         finally:
             self.stop_monitoring()
+            # stop_monitoring returns early if startup failed; flush regardless
+            self.flush_notifications()
             logger.info("Bot shutdown complete")
@@ -3,18 +3,21 @@
 from src.database.models import (
     Base,
     SentimentAnalysis,
+    SentimentCache,
     SocialMediaPost,
     SystemLog,
     Trade,
 )
-from src.database.repository import DatabaseRepository
+from src.database.repository import DatabaseRepository, get_repository
 
 __all__ = [
     "Base",
     "SocialMediaPost",
     "SentimentAnalysis",
+    "SentimentCache",
     "Trade",
     "SystemLog",
     "DatabaseRepository",
+    "get_repository",
 ]
 
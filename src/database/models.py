@@ -1,6 +1,6 @@
 """Database models for storing posts, sentiment analysis, and trades."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 from sqlalchemy import (
@@ -9,9 +9,11 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
@@ -49,7 +51,7 @@ class SentimentAnalysis(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     post_id = Column(
-        Integer, ForeignKey("social_media_posts.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("social_media_posts.id", ondelete="CASCADE"), nullable=False, index=True
     )
     score = Column(Integer, nullable=False)  # 0-10
     reasoning = Column(Text, nullable=False)
@@ -66,10 +68,37 @@ class SentimentAnalysis(Base):
         return f"<SentimentAnalysis(id={self.id}, score={self.score}, analyzed_at={self.analyzed_at})>"
 
 
+class SentimentCache(Base):
+    """Model for caching Claude results by content hash across restarts."""
+
+    __tablename__ = "sentiment_cache"
+
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 of stripped content
+    model_version = Column(String(50), primary_key=True)
+    score = Column(Integer, nullable=False)  # 0-10
+    reasoning = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<SentimentCache(content_hash={self.content_hash[:8]}, score={self.score})>"
+
+
 class Trade(Base):
     """Model for storing trade execution details."""
 
     __tablename__ = "trades"
+    __table_args__ = (
+        # get_open_trade: partial index holding only open trades, so it stays
+        # at about one row per symbol regardless of history. The predicates
+        # match the "is_open IS true" filter as each dialect renders it;
+        # other databases get a plain index on symbol.
+        Index(
+            "ix_trade_open_by_symbol",
+            "symbol",
+            postgresql_where=text("is_open IS TRUE"),
+            sqlite_where=text("is_open IS 1"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     sentiment_id = Column(
@@ -106,7 +135,7 @@ class Trade(Base):
     
     # Timestamps
     opened_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    closed_at = Column(DateTime, nullable=True)
+    closed_at = Column(DateTime, nullable=True, index=True)
     
     # Close reason
     close_reason = Column(String(100), nullable=True)  # e.g., "TRAILING_STOP", "NEW_SIGNAL", "MANUAL"
@@ -114,6 +143,16 @@ class Trade(Base):
     # Relationship to sentiment
     sentiment = relationship("SentimentAnalysis", back_populates="trade")
 
+    @property
+    def opened_at_ms(self) -> Optional[int]:
+        """Opening time as Unix epoch milliseconds (naive timestamps are UTC)."""
+        if self.opened_at is None:
+            return None
+        opened_at = self.opened_at
+        if opened_at.tzinfo is None:
+            opened_at = opened_at.replace(tzinfo=timezone.utc)
+        return int(opened_at.timestamp() * 1000)
+
     def __repr__(self) -> str:
         status = "OPEN" if self.is_open else "CLOSED"
         return f"<Trade(id={self.id}, side={self.side}, leverage={self.leverage}x, status={status})>"
@@ -1,17 +1,129 @@
 """Database repository for CRUD operations."""
 
-from datetime import datetime, timezone
-from typing import List, Optional
+import atexit
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Deque, Dict, Iterator, List, Optional
 
-from sqlalchemy import create_engine, desc
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, desc, event, exists, func, insert, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine, Row, make_url
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from config.settings import settings
-from src.database.models import Base, SentimentAnalysis, SocialMediaPost, SystemLog, Trade
+from config.settings import get_settings
+from src.database.models import (
+    Base,
+    SentimentAnalysis,
+    SentimentCache,
+    SocialMediaPost,
+    SystemLog,
+    Trade,
+)
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Seconds to wait for a pooled connection, and max connection age before recycling
+DB_POOL_TIMEOUT = 30
+DB_POOL_RECYCLE = 3600
+
+
+def _engine_options(database_url: str) -> Dict:
+    """
+    Build create_engine() keyword arguments for a database URL.
+
+    Server databases get a sized QueuePool with pre-ping and recycling so
+    stale connections are replaced transparently. SQLite connections are
+    shared across threads; in-memory databases use a single static
+    connection so every thread sees the same data.
+
+    Args:
+        database_url: SQLAlchemy database URL
+
+    Returns:
+        Keyword arguments for create_engine
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        options: Dict = {"connect_args": {"check_same_thread": False}}
+        if url.database in (None, "", ":memory:"):
+            options["poolclass"] = StaticPool
+        return options
+    
+    settings = get_settings()
+    return {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+# Pragmas applied to every SQLite connection: WAL journaling with NORMAL sync
+# (fsync at checkpoints rather than every commit), in-memory temp tables and
+# a 256 MB memory map
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply SQLITE_PRAGMAS to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _build_engine(database_url: str) -> Engine:
+    """Create an engine for a database URL with the pool and SQLite setup applied."""
+    engine = create_engine(database_url, echo=False, **_engine_options(database_url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """
+    Get the process-wide engine for the configured database, created on first use.
+
+    Every repository built without an explicit URL shares this engine, so
+    the process holds a single connection pool however many are created.
+    """
+    return _build_engine(get_settings().database_url)
+
+
+@lru_cache(maxsize=1)
+def _get_session_factory() -> sessionmaker:
+    """Get the sessionmaker bound to the shared engine."""
+    return sessionmaker(bind=get_engine(), expire_on_commit=False)
+
+
+# Number of content hashes known to be stored that post_exists keeps in memory
+POST_HASH_CACHE_SIZE = 100_000
+
+# Maximum rows per multi-row INSERT in bulk ingestion
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# System log rows are buffered and written in batches of up to this many rows
+LOG_BATCH_SIZE = 100
+
+# Seconds between background flushes of buffered system log rows
+LOG_FLUSH_INTERVAL = 5.0
+
 
 class DatabaseRepository:
     """Repository for database operations."""
@@ -21,11 +133,29 @@ class DatabaseRepository:
         Initialize database repository.
 
         Args:
-            database_url: Optional database URL override
+            database_url: Optional database URL override. When given, the
+                repository gets its own engine (used by tests); otherwise it
+                binds to the shared module-level engine.
         """
-        self.database_url = database_url or settings.database_url
-        self.engine = create_engine(self.database_url, echo=False)
-        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+        if database_url:
+            self.database_url = database_url
+            self.engine = _build_engine(database_url)
+            self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+        else:
+            self.database_url = get_settings().database_url
+            self.engine = get_engine()
+            self.SessionLocal = _get_session_factory()
+        
+        # Content hashes known to be stored, oldest first. Posts are never
+        # deleted, so a positive answer stays valid; misses go to the database.
+        self._known_post_hashes: "OrderedDict[str, None]" = OrderedDict()
+        self._known_post_hashes_lock = threading.Lock()
+        
+        # Buffered system log rows; the flusher thread starts on first use
+        self._log_buffer: Deque[Dict] = deque()
+        self._log_lock = threading.Lock()
+        self._log_flusher: Optional[threading.Thread] = None
+        
         logger.info(f"Database repository initialized: {self.database_url}")
 
     def create_tables(self) -> None:
@@ -37,6 +167,45 @@ class DatabaseRepository:
         """Get a new database session."""
         return self.SessionLocal()
 
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        Provide a transactional session scope.
+
+        Commits on success, rolls back on error, and always closes the
+        session so its connection goes back to the pool.
+        """
+        session = self.SessionLocal()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _insert_ignoring_conflicts(self, model, index_elements: List[str]):
+        """
+        Build an INSERT that skips rows conflicting on a unique index.
+
+        Uses ON CONFLICT DO NOTHING on PostgreSQL and SQLite; other
+        backends get a plain INSERT.
+
+        Args:
+            model: ORM model to insert into
+            index_elements: Columns of the unique index to check
+
+        Returns:
+            Insert statement
+        """
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            return pg_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+        if dialect == "sqlite":
+            return sqlite_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+        return insert(model)
+
     # Social Media Posts
     def create_post(
         self,
@@ -46,23 +215,75 @@ class DatabaseRepository:
         posted_at: datetime,
         post_id: Optional[str] = None,
         engagement_metrics: Optional[str] = None,
-    ) -> SocialMediaPost:
-        """Create a new social media post record."""
-        with self.get_session() as session:
-            post = SocialMediaPost(
-                content_hash=content_hash,
-                platform=platform,
-                content=content,
-                post_id=post_id,
-                posted_at=posted_at,
-                fetched_at=datetime.now(timezone.utc),
-                engagement_metrics=engagement_metrics,
-            )
-            session.add(post)
-            session.commit()
-            session.refresh(post)
-            logger.info(f"Created post record: {post.id} from {platform}")
-            return post
+    ) -> Optional[SocialMediaPost]:
+        """
+        Create a new social media post record.
+
+        The insert is idempotent on content_hash: if the post was already
+        stored (e.g. by a concurrent poll) nothing is written.
+
+        Returns:
+            The stored post, or None if a post with this hash already exists
+        """
+        values = {
+            "content_hash": content_hash,
+            "platform": platform,
+            "content": content,
+            "post_id": post_id,
+            "posted_at": posted_at,
+            "fetched_at": datetime.now(timezone.utc),
+            "engagement_metrics": engagement_metrics,
+        }
+        stmt = (
+            self._insert_ignoring_conflicts(SocialMediaPost, ["content_hash"])
+            .values(**values)
+            .returning(SocialMediaPost.id)
+        )
+        with self.session_scope() as session:
+            new_id = session.execute(stmt).scalar()
+        
+        self._remember_post_hash(content_hash)
+        if new_id is None:
+            logger.info(f"Post already stored: {content_hash[:8]}...")
+            return None
+        
+        logger.info(f"Created post record: {new_id} from {platform}")
+        return SocialMediaPost(id=new_id, **values)
+
+    def create_posts_bulk(self, rows: List[Dict]) -> List[int]:
+        """
+        Insert many social media posts in one transaction.
+
+        Rows are written with multi-row INSERT statements of up to
+        BULK_INSERT_CHUNK_SIZE rows; posts whose content_hash is already
+        stored are skipped.
+
+        Args:
+            rows: Dicts of SocialMediaPost column values (fetched_at defaults to now)
+
+        Returns:
+            IDs of the newly stored posts
+        """
+        if not rows:
+            return []
+        
+        now = datetime.now(timezone.utc)
+        rows = [{"fetched_at": now, **row} for row in rows]
+        
+        new_ids: List[int] = []
+        with self.session_scope() as session:
+            for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                stmt = (
+                    self._insert_ignoring_conflicts(SocialMediaPost, ["content_hash"])
+                    .values(rows[start:start + BULK_INSERT_CHUNK_SIZE])
+                    .returning(SocialMediaPost.id)
+                )
+                new_ids.extend(session.execute(stmt).scalars())
+        
+        for row in rows:
+            self._remember_post_hash(row["content_hash"])
+        logger.info(f"Bulk stored {len(new_ids)} of {len(rows)} posts")
+        return new_ids
 
     def get_post_by_hash(self, content_hash: str) -> Optional[SocialMediaPost]:
         """Get post by content hash."""
@@ -70,19 +291,71 @@ class DatabaseRepository:
             return session.query(SocialMediaPost).filter_by(content_hash=content_hash).first()
 
     def post_exists(self, content_hash: str) -> bool:
-        """Check if post already exists."""
-        return self.get_post_by_hash(content_hash) is not None
+        """
+        Check if post already exists.
+
+        Hashes already known to be stored are answered from memory; otherwise
+        an EXISTS query on the content_hash index is run (no row fetch).
+        """
+        with self._known_post_hashes_lock:
+            if content_hash in self._known_post_hashes:
+                self._known_post_hashes.move_to_end(content_hash)
+                return True
+        
+        stmt = lambda_stmt(
+            lambda: select(exists().where(SocialMediaPost.content_hash == content_hash))
+        )
+        with self.get_session() as session:
+            found = bool(session.scalar(stmt))
+        
+        if found:
+            self._remember_post_hash(content_hash)
+        return found
+
+    def _remember_post_hash(self, content_hash: str) -> None:
+        """Record a content hash as stored, evicting the oldest past POST_HASH_CACHE_SIZE."""
+        with self._known_post_hashes_lock:
+            self._known_post_hashes[content_hash] = None
+            self._known_post_hashes.move_to_end(content_hash)
+            if len(self._known_post_hashes) > POST_HASH_CACHE_SIZE:
+                self._known_post_hashes.popitem(last=False)
 
     def get_recent_posts(self, limit: int = 10) -> List[SocialMediaPost]:
-        """Get recent posts ordered by fetch time."""
+        """Get recent posts ordered by fetch time, with their sentiment loaded."""
         with self.get_session() as session:
             return (
                 session.query(SocialMediaPost)
+                .options(selectinload(SocialMediaPost.sentiment))
                 .order_by(SocialMediaPost.fetched_at.desc())
                 .limit(limit)
                 .all()
             )
 
+    def get_recent_posts_summary(self, limit: int = 10) -> List[Row]:
+        """
+        Get lightweight rows for recent posts, for listings.
+
+        Projects only the listed columns instead of hydrating ORM objects.
+
+        Args:
+            limit: Maximum number of posts
+
+        Returns:
+            Rows with id, platform, post_id, posted_at and fetched_at, newest first
+        """
+        with self.get_session() as session:
+            return session.execute(
+                select(
+                    SocialMediaPost.id,
+                    SocialMediaPost.platform,
+                    SocialMediaPost.post_id,
+                    SocialMediaPost.posted_at,
+                    SocialMediaPost.fetched_at,
+                )
+                .order_by(SocialMediaPost.fetched_at.desc())
+                .limit(limit)
+            ).all()
+
     # Sentiment Analysis
     def create_sentiment(
         self,
@@ -102,7 +375,6 @@ class DatabaseRepository:
             )
             session.add(sentiment)
             session.commit()
-            session.refresh(sentiment)
             logger.info(f"Created sentiment analysis: {sentiment.id} with score {score}")
             return sentiment
 
@@ -111,6 +383,52 @@ class DatabaseRepository:
         with self.get_session() as session:
             return session.query(SentimentAnalysis).filter_by(post_id=post_id).first()
 
+    def get_sentiments_by_post_ids(self, post_ids: List[int]) -> Dict[int, SentimentAnalysis]:
+        """
+        Get sentiment analyses for several posts in a single query.
+
+        Args:
+            post_ids: Post IDs to look up
+
+        Returns:
+            Mapping of post ID to its sentiment analysis (posts without one are omitted)
+        """
+        if not post_ids:
+            return {}
+        with self.get_session() as session:
+            sentiments = (
+                session.query(SentimentAnalysis)
+                .filter(SentimentAnalysis.post_id.in_(post_ids))
+                .all()
+            )
+            return {sentiment.post_id: sentiment for sentiment in sentiments}
+
+    # Sentiment Cache
+    def get_cached_sentiment(self, content_hash: str, model_version: str) -> Optional[SentimentCache]:
+        """Get a cached Claude result for content analyzed by the given model."""
+        with self.get_session() as session:
+            return session.get(SentimentCache, (content_hash, model_version))
+
+    def cache_sentiment(
+        self,
+        content_hash: str,
+        model_version: str,
+        score: int,
+        reasoning: str,
+    ) -> None:
+        """Store (or replace) a Claude result for content analyzed by the given model."""
+        with self.get_session() as session:
+            session.merge(
+                SentimentCache(
+                    content_hash=content_hash,
+                    model_version=model_version,
+                    score=score,
+                    reasoning=reasoning,
+                    created_at=datetime.now(timezone.utc),
+                )
+            )
+            session.commit()
+
     # Trades
     def create_trade(
         self,
@@ -147,14 +465,17 @@ class DatabaseRepository:
             )
             session.add(trade)
             session.commit()
-            session.refresh(trade)
             logger.info(f"Created trade record: {trade.id} - {side} {leverage}x")
             return trade
 
     def get_open_trade(self, symbol: str = "BTCUSDT") -> Optional[Trade]:
         """Get currently open trade for symbol."""
+        # lambda_stmt caches the constructed statement; symbol is bound per call
+        stmt = lambda_stmt(
+            lambda: select(Trade).where(Trade.symbol == symbol, Trade.is_open.is_(True)).limit(1)
+        )
         with self.get_session() as session:
-            return session.query(Trade).filter_by(symbol=symbol, is_open=True).first()
+            return session.execute(stmt).scalars().first()
 
     def close_trade(
         self,
@@ -167,7 +488,7 @@ class DatabaseRepository:
     ) -> Trade:
         """Close an open trade."""
         with self.get_session() as session:
-            trade = session.query(Trade).filter_by(id=trade_id).first()
+            trade = session.get(Trade, trade_id)
             if trade:
                 trade.is_open = False
                 trade.exit_price = exit_price
@@ -177,7 +498,6 @@ class DatabaseRepository:
                 trade.exit_order_id = exit_order_id
                 trade.closed_at = datetime.now(timezone.utc)
                 session.commit()
-                session.refresh(trade)
                 logger.info(f"Closed trade {trade_id}: PnL {pnl_percentage:.2f}%")
             return trade
 
@@ -192,18 +512,48 @@ class DatabaseRepository:
             Trade object or None if not found
         """
         with self.get_session() as session:
-            return session.query(Trade).filter(Trade.id == trade_id).first()
+            return session.get(Trade, trade_id)
     
     def get_recent_trades(self, limit: int = 10) -> List[Trade]:
-        """Get recent trades ordered by opening time."""
+        """Get recent trades ordered by opening time, with sentiment and post loaded."""
         with self.get_session() as session:
             return (
                 session.query(Trade)
+                .options(selectinload(Trade.sentiment).selectinload(SentimentAnalysis.post))
                 .order_by(desc(Trade.opened_at))
                 .limit(limit)
                 .all()
             )
     
+    def get_recent_trades_summary(self, limit: int = 10) -> List[Row]:
+        """
+        Get lightweight rows for recent trades, for dashboards.
+
+        Projects only the listed columns instead of hydrating ORM objects;
+        use get_recent_trades when full Trade records are needed.
+
+        Args:
+            limit: Maximum number of trades
+
+        Returns:
+            Rows with id, side, leverage, is_open, pnl_usd, pnl_percentage
+            and opened_at, newest first
+        """
+        with self.get_session() as session:
+            return session.execute(
+                select(
+                    Trade.id,
+                    Trade.side,
+                    Trade.leverage,
+                    Trade.is_open,
+                    Trade.pnl_usd,
+                    Trade.pnl_percentage,
+                    Trade.opened_at,
+                )
+                .order_by(desc(Trade.opened_at))
+                .limit(limit)
+            ).all()
+    
     def get_trades_last_24h(self) -> List[Trade]:
         """
         Get all trades closed in the last 24 hours.
@@ -211,7 +561,6 @@ class DatabaseRepository:
         Returns:
             List of Trade objects closed in the last 24 hours
         """
-        from datetime import datetime, timedelta
         with self.get_session() as session:
             cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
             return (
@@ -221,11 +570,31 @@ class DatabaseRepository:
                 .all()
             )
 
+    def get_pnl_sum_last_24h(self) -> float:
+        """
+        Sum realized PnL of trades closed in the last 24 hours.
+
+        Aggregates in SQL instead of loading every Trade row.
+
+        Returns:
+            Total PnL in USD (0.0 if there are no such trades)
+        """
+        with self.get_session() as session:
+            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
+            total = (
+                session.query(func.sum(Trade.pnl_usd))
+                .filter(Trade.is_open.is_(False))
+                .filter(Trade.closed_at >= cutoff_time)
+                .filter(Trade.pnl_usd.isnot(None))
+                .scalar()
+            )
+            return float(total or 0.0)
+
     # System Logs
     def get_total_trades_count(self) -> int:
         """Get total number of trades in the database."""
         with self.get_session() as session:
-            return session.query(Trade).count()
+            return session.query(func.count(Trade.id)).scalar() or 0
 
     def create_log(
         self,
@@ -233,17 +602,73 @@ class DatabaseRepository:
         module: str,
         message: str,
         exception: Optional[str] = None,
-    ) -> SystemLog:
-        """Create a system log entry."""
-        with self.get_session() as session:
-            log = SystemLog(
-                level=level,
-                module=module,
-                message=message,
-                exception=exception,
-                timestamp=datetime.now(timezone.utc),
+    ) -> None:
+        """
+        Queue a system log entry for the next batched write.
+
+        Rows are written once LOG_BATCH_SIZE are buffered, every
+        LOG_FLUSH_INTERVAL seconds, and at interpreter exit.
+        """
+        self._log_buffer.append(
+            {
+                "level": level,
+                "module": module,
+                "message": message,
+                "exception": exception,
+                "timestamp": datetime.now(timezone.utc),
+            }
+        )
+        self._start_log_flusher()
+        if len(self._log_buffer) >= LOG_BATCH_SIZE:
+            self.flush_logs()
+
+    def flush_logs(self) -> int:
+        """
+        Write all buffered system log entries in a single INSERT.
+
+        Returns:
+            Number of rows written
+        """
+        with self._log_lock:
+            rows = []
+            while self._log_buffer:
+                rows.append(self._log_buffer.popleft())
+            if not rows:
+                return 0
+            try:
+                with self.session_scope() as session:
+                    session.execute(insert(SystemLog), rows)
+            except Exception as e:
+                logger.error(f"Error writing {len(rows)} system log entries: {e}")
+                return 0
+            return len(rows)
+
+    def _start_log_flusher(self) -> None:
+        """Start the background log flusher and exit hook once."""
+        if self._log_flusher is not None:
+            return
+        with self._log_lock:
+            if self._log_flusher is not None:
+                return
+            self._log_flusher = threading.Thread(
+                target=self._flush_logs_periodically, name="LogFlusher", daemon=True
             )
-            session.add(log)
-            session.commit()
-            return log
+            self._log_flusher.start()
+            atexit.register(self.flush_logs)
+
+    def _flush_logs_periodically(self) -> None:
+        """Flush buffered system log entries every LOG_FLUSH_INTERVAL seconds."""
+        while True:
+            time.sleep(LOG_FLUSH_INTERVAL)
+            self.flush_logs()
+
+
+@lru_cache(maxsize=1)
+def get_repository() -> DatabaseRepository:
+    """
+    Get the shared database repository, created on first access.
 
+    The bot, position manager, sentiment analyzer and monitors all use this
+    instance, so the process holds one engine and one connection pool.
+    """
+    return DatabaseRepository()
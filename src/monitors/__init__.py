@@ -1,5 +1,7 @@
 """Social media monitoring modules."""
 
+from src.monitors.base import RapidAPIPollingMonitor
+from src.monitors.scheduler import PollScheduler
 from src.monitors.twitter_rapidapi import TwitterRapidAPI as TwitterMonitor
 
-__all__ = ["TwitterMonitor"]
+__all__ = ["PollScheduler", "RapidAPIPollingMonitor", "TwitterMonitor"]
@@ -0,0 +1,357 @@
+"""Shared polling machinery for RapidAPI social media monitors."""
+
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.settings import get_settings
+from src.database.repository import get_repository
+from src.monitors.scheduler import PollScheduler
+from src.notifications.telegram_notifier import TelegramNotifier
+from src.utils import hash_content, get_timestamp, setup_logger
+
+logger = setup_logger(__name__)
+
+# Normal polling cadence, and the ceiling for backing off after a 429
+POLL_INTERVAL_SECONDS = 30
+MAX_BACKOFF_SECONDS = 900
+
+# Adaptive polling: the interval halves after a new post (down to the
+# minimum) and grows 15% after each quiet poll (up to the maximum)
+MIN_POLL_INTERVAL_SECONDS = 5
+MAX_POLL_INTERVAL_SECONDS = 120
+POLL_SPEEDUP_FACTOR = 0.5
+POLL_SLOWDOWN_FACTOR = 1.15
+
+# Below this share of the rate-limit quota, polls are spread evenly over the
+# time left until the window resets
+RATE_LIMIT_LOW_WATERMARK = 0.1
+
+# Connection pool for the keep-alive session, and transient gateway errors
+# retried with backoff before a poll gives up
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 8
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=("GET",),
+    raise_on_status=False,
+)
+
+
+class RapidAPIPollingMonitor(ABC):
+    """
+    Base class for monitors that poll a RapidAPI endpoint for new posts.
+
+    Handles the HTTP session, rate-limit tracking and backoff, adaptive
+    poll scheduling, and storing new posts. Subclasses provide the
+    platform-specific connection test, fetch and timestamp parsing.
+    """
+
+    # Platform code stored with posts, e.g. "TWITTER"
+    PLATFORM: str = ""
+    # Human-readable platform name for logs and alerts
+    DISPLAY_NAME: str = ""
+    # What one post is called in logs, e.g. "tweet"
+    ITEM_NAME: str = "post"
+
+    def __init__(self, api_host: str, on_new_post: Optional[Callable] = None):
+        """
+        Initialize the monitor.
+
+        Args:
+            api_host: RapidAPI host of the platform's API
+            on_new_post: Callback receiving each newly stored post
+        """
+        settings = get_settings()
+        self.api_key = settings.rapidapi_key
+        self.api_host = api_host
+        self.base_url = f"https://{self.api_host}"
+        self.headers = {
+            "X-RapidAPI-Key": self.api_key,
+            "X-RapidAPI-Host": self.api_host
+        }
+        # Keep-alive session so each poll reuses the open TCP/TLS connection
+        # instead of resolving and handshaking again
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=HTTP_RETRY,
+        ))
+        self.on_new_post = on_new_post
+        self.db = get_repository()
+        self.is_monitoring = False
+        self.last_rate_limit = {"limit": None, "remaining": None, "reset": None}
+        self._rate_limit_backoff = 0
+        self._poll_interval = float(POLL_INTERVAL_SECONDS)
+        self._last_post_id: Optional[str] = None
+        self._scheduler: Optional[PollScheduler] = None
+        
+        # Reused for rate-limit alerts
+        try:
+            self._telegram: Optional[TelegramNotifier] = TelegramNotifier()
+        except Exception as e:
+            logger.debug(f"Telegram notifier unavailable: {e}")
+            self._telegram = None
+        
+        logger.info(f"{self.DISPLAY_NAME} RapidAPI monitor initialized")
+
+    @abstractmethod
+    def test_connection(self) -> bool:
+        """Test RapidAPI connection."""
+
+    @abstractmethod
+    def fetch_latest(self, last_seen_id: Optional[str] = None) -> List[Dict]:
+        """
+        Fetch the most recent post.
+
+        Args:
+            last_seen_id: ID of the newest post already handled
+
+        Returns:
+            A list holding the latest post, or empty if there is none
+        """
+
+    @abstractmethod
+    def _parse_posted_at(self, created_at: str) -> datetime:
+        """
+        Parse the platform's created_at timestamp.
+
+        Raises:
+            ValueError: If the timestamp cannot be parsed
+        """
+
+    def _log_rate_limit(self, response: requests.Response) -> None:
+        """Log RapidAPI rate limit information from response headers."""
+        try:
+            # RapidAPI uses lowercase header names
+            limit = response.headers.get('x-ratelimit-requests-limit', 'N/A')
+            remaining = response.headers.get('x-ratelimit-requests-remaining', 'N/A')
+            reset = response.headers.get('x-ratelimit-requests-reset', 'N/A')
+            
+            # Store for later retrieval
+            self.last_rate_limit = {
+                "limit": limit if limit != 'N/A' else None,
+                "remaining": remaining if remaining != 'N/A' else None,
+                "reset": reset if reset != 'N/A' else None
+            }
+            
+            if remaining != 'N/A':
+                logger.info(f"📊 RapidAPI {self.DISPLAY_NAME} Rate Limit - Remaining: {remaining}/{limit}, Resets: {reset}")
+                
+                # Warn if approaching limit
+                if remaining != 'N/A' and limit != 'N/A':
+                    remaining_pct = (int(remaining) / int(limit)) * 100
+                    if remaining_pct < 10:
+                        logger.warning(f"⚠️ RapidAPI {self.DISPLAY_NAME} rate limit low: {remaining_pct:.1f}% remaining!")
+        except Exception as e:
+            logger.debug(f"Could not parse rate limit headers: {e}")
+
+    def _handle_rate_limited(self) -> None:
+        """Alert on a 429 response and back off exponentially until requests succeed again."""
+        reset = self.last_rate_limit.get('reset', 'unknown')
+        logger.error(f"⚠️ RapidAPI {self.DISPLAY_NAME} RATE LIMIT exceeded!")
+        logger.error(f"Rate limit will reset at: {reset}")
+        
+        # Notify via Telegram if a notifier is available
+        try:
+            self._telegram.notify_error({
+                "type": "RateLimit",
+                "message": f"{self.DISPLAY_NAME} API rate limit exceeded. Resets at: {reset}",
+                "component": f"{self.DISPLAY_NAME} Monitor"
+            })
+        except Exception as e:
+            logger.debug(f"Could not send Telegram notification: {e}")
+        
+        self._rate_limit_backoff = min(
+            max(self._rate_limit_backoff * 2, POLL_INTERVAL_SECONDS * 2),
+            MAX_BACKOFF_SECONDS
+        )
+
+    def process_item(self, item: Dict) -> Optional[Dict]:
+        """
+        Store a fetched post if it is new.
+
+        Args:
+            item: Post dict from the fetch methods
+
+        Returns:
+            Processed post data for sentiment analysis, or None if the post
+            was already stored or could not be processed
+        """
+        try:
+            # Create content hash for deduplication
+            content_hash = hash_content(item["text"])
+            
+            # Check if post already exists
+            if self.db.post_exists(content_hash):
+                logger.debug(f"{self.ITEM_NAME.capitalize()} already exists: {content_hash[:8]}...")
+                return None
+            
+            # Prepare engagement metrics
+            engagement_metrics = _json_dumps(item.get("public_metrics", {}))
+            
+            try:
+                posted_at = self._parse_posted_at(item["created_at"])
+            except (ValueError, AttributeError):
+                # Fallback to current time if parsing fails
+                posted_at = datetime.now(timezone.utc)
+            
+            # Store in database
+            post = self.db.create_post(
+                content_hash=content_hash,
+                platform=item["platform"],
+                content=item["text"],
+                posted_at=posted_at,
+                post_id=str(item["id"]),
+                engagement_metrics=engagement_metrics
+            )
+            if post is None:
+                # Stored by a concurrent poll since the existence check
+                return None
+            
+            logger.info(f"✅ New {self.DISPLAY_NAME} {self.ITEM_NAME} stored: {post.id} - {item['text'][:50]}...")
+            
+            # Return processed data for sentiment analysis
+            return {
+                "post_id": post.id,
+                "platform": item["platform"],
+                "content": item["text"],
+                "external_id": str(item["id"]),
+                "created_at": item["created_at"]
+            }
+        
+        except Exception as e:
+            logger.error(f"Error processing {self.ITEM_NAME}: {e}")
+            return None
+
+    def start_monitoring(self, scheduler: Optional[PollScheduler] = None) -> None:
+        """
+        Start monitoring using polling.
+
+        Args:
+            scheduler: Shared poll scheduler to register with; when omitted
+                the monitor runs its own polling thread
+        """
+        logger.info(f"Starting {self.DISPLAY_NAME} RapidAPI monitoring...")
+        
+        # Test connection first
+        if not self.test_connection():
+            logger.error("Cannot start monitoring - API connection failed")
+            return
+        
+        # Get only the most recent post first
+        for item in self.fetch_latest():
+            self.process_item(item)
+        
+        # Start polling monitoring
+        self.is_monitoring = True
+        self._start_polling_monitoring(scheduler)
+
+    def _start_polling_monitoring(self, scheduler: Optional[PollScheduler] = None) -> None:
+        """Schedule poll_once on the given scheduler, or on a private one."""
+        if scheduler is None:
+            scheduler = self._scheduler = PollScheduler(name=f"{self.DISPLAY_NAME.replace(' ', '')}Polling")
+            scheduler.start()
+        
+        scheduler.add(self.poll_once, delay=self._next_poll_delay())
+        logger.info(
+            f"🚀 {self.DISPLAY_NAME} polling monitoring started - checking latest {self.ITEM_NAME} "
+            f"every {POLL_INTERVAL_SECONDS}s, adapting to activity"
+        )
+
+    def poll_once(self) -> Optional[float]:
+        """
+        Check for a new post once.
+
+        Returns:
+            Seconds until the next poll (longer while rate limited), or None
+            once monitoring has stopped
+        """
+        if not self.is_monitoring:
+            return None
+        
+        try:
+            items = self.fetch_latest(last_seen_id=self._last_post_id)
+            
+            # Process only if this is a NEW post (different from last one)
+            if items and items[0]["id"] != self._last_post_id:
+                processed = self.process_item(items[0])
+                if processed and self.on_new_post:
+                    self.on_new_post(processed)
+                self._last_post_id = items[0]["id"]
+            else:
+                processed = None
+            
+            # Poll faster while posts are coming in, slower while it is quiet
+            if processed:
+                self._poll_interval = max(MIN_POLL_INTERVAL_SECONDS, self._poll_interval * POLL_SPEEDUP_FACTOR)
+            else:
+                self._poll_interval = min(MAX_POLL_INTERVAL_SECONDS, self._poll_interval * POLL_SLOWDOWN_FACTOR)
+            
+            return self._next_poll_delay()
+        
+        except Exception as e:
+            logger.error(f"Error in {self.DISPLAY_NAME} polling monitoring: {e}")
+            return POLL_INTERVAL_SECONDS
+
+    def _next_poll_delay(self) -> float:
+        """Get seconds to wait before the next poll, backing off while rate limited."""
+        if not self._rate_limit_backoff:
+            return self._quota_paced_interval()
+        
+        # Never retry before RapidAPI says the window resets
+        delay = self._rate_limit_backoff
+        reset = self.last_rate_limit.get("reset")
+        if reset and str(reset).isdigit():
+            delay = max(delay, int(reset))
+        return min(delay, MAX_BACKOFF_SECONDS)
+
+    def _quota_paced_interval(self) -> float:
+        """Get the adaptive poll interval, stretched so a low quota lasts until reset."""
+        delay = self._poll_interval
+        limit = str(self.last_rate_limit.get("limit") or "")
+        remaining = str(self.last_rate_limit.get("remaining") or "")
+        reset = str(self.last_rate_limit.get("reset") or "")
+        if limit.isdigit() and remaining.isdigit() and reset.isdigit():
+            if int(remaining) < int(limit) * RATE_LIMIT_LOW_WATERMARK:
+                delay = max(delay, int(reset) / max(int(remaining), 1))
+        return min(delay, MAX_BACKOFF_SECONDS)
+
+    def stop_monitoring(self) -> None:
+        """Stop monitoring."""
+        self.is_monitoring = False
+        if self._scheduler:
+            self._scheduler.stop()
+            self._scheduler = None
+        self.session.close()
+        logger.info(f"{self.DISPLAY_NAME} monitoring stopped")
+
+    def get_monitoring_status(self) -> Dict:
+        """Get current monitoring status."""
+        return {
+            "monitoring": self.is_monitoring,
+            "platform": self.PLATFORM,
+            "method": "RapidAPI Polling",
+            "real_time": False,
+            "polling_interval": f"{self._poll_interval:.0f} seconds",
+            "last_check": get_timestamp(),
+            "rate_limit": self.last_rate_limit
+        }
@@ -0,0 +1,104 @@
+"""Single-thread scheduler for periodic monitor polls."""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# A poll callback returns the seconds until it should run again, or None to stop
+PollCallback = Callable[[], Optional[float]]
+
+
+class PollScheduler:
+    """
+    Run periodic poll callbacks from one background thread.
+
+    Callbacks are kept in a heap ordered by their next due time. Each
+    callback returns the delay before its next run, so monitors can stretch
+    their own interval (e.g. while rate limited) without the scheduler
+    knowing why. Callbacks run one at a time.
+    """
+
+    def __init__(self, name: str = "PollScheduler"):
+        """
+        Initialize the scheduler.
+
+        Args:
+            name: Name of the background thread
+        """
+        self.name = name
+        self._heap: List[Tuple[float, int, PollCallback]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, callback: PollCallback, delay: float = 0.0) -> None:
+        """
+        Schedule a poll callback.
+
+        Args:
+            callback: Callable returning seconds until its next run, or None
+            delay: Seconds before the first run
+        """
+        with self._lock:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), callback))
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Stop the scheduler thread and drop all scheduled callbacks.
+
+        Args:
+            timeout: Seconds to wait for an in-flight poll to finish
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        with self._lock:
+            self._heap.clear()
+
+    def is_alive(self) -> bool:
+        """Whether the scheduler thread is running."""
+        return bool(self._thread and self._thread.is_alive())
+
+    def _run(self) -> None:
+        """Run due callbacks, sleeping until the next one is due."""
+        while not self._stopped.is_set():
+            with self._lock:
+                if self._heap and self._heap[0][0] <= time.monotonic():
+                    _, _, callback = heapq.heappop(self._heap)
+                else:
+                    callback = None
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._wakeup.clear()
+
+            if callback is None:
+                self._wakeup.wait(timeout)
+                continue
+
+            try:
+                next_delay = callback()
+            except Exception as e:
+                # Pollers handle their own errors; one that raises is dropped
+                logger.error(f"Scheduled poll {getattr(callback, '__qualname__', callback)} failed and was removed: {e}")
+                continue
+
+            if next_delay is not None and not self._stopped.is_set():
+                self.add(callback, next_delay)
@@ -1,78 +1,43 @@
 """Truth Social monitor using RapidAPI for real-time data."""
 
-import json
+import logging
 import re
-import time
-import threading
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Callable
-from urllib.parse import quote
+from typing import Callable, Dict, List, Optional
 
-import requests
-from config.settings import settings
-from src.database.repository import DatabaseRepository
-from src.utils import hash_content, get_timestamp, setup_logger
+from config.settings import get_settings
+from src.monitors.base import RapidAPIPollingMonitor, _json_loads
+from src.utils import setup_logger
 
 logger = setup_logger(__name__)
 
+# Strips HTML tags from post content
+_TAG_RE = re.compile(r'<[^>]+>')
 
-class TruthSocialRapidAPI:
+
+class TruthSocialRapidAPI(RapidAPIPollingMonitor):
     """Truth Social monitor using RapidAPI for real-time monitoring."""
 
+    PLATFORM = "TRUTH_SOCIAL"
+    DISPLAY_NAME = "Truth Social"
+    ITEM_NAME = "post"
+
     def __init__(self, on_new_post: Optional[Callable] = None):
         """Initialize Truth Social RapidAPI monitor."""
-        self.api_key = settings.rapidapi_key  # Using same RapidAPI key
-        self.api_host = settings.truth_social_rapidapi_host
-        self.base_url = f"https://{self.api_host}"
+        settings = get_settings()
+        super().__init__(settings.truth_social_rapidapi_host, on_new_post)
         self.username = settings.trump_truth_social_username
-        self.headers = {
-            "X-RapidAPI-Key": self.api_key,
-            "X-RapidAPI-Host": self.api_host
-        }
-        self.on_new_post = on_new_post
-        self.db = DatabaseRepository()
-        self.is_monitoring = False
-        self.last_rate_limit = {"limit": None, "remaining": None, "reset": None}
-        
-        logger.info("Truth Social RapidAPI monitor initialized")
-
-    def _log_rate_limit(self, response: requests.Response) -> None:
-        """Log RapidAPI rate limit information from response headers."""
-        try:
-            # RapidAPI uses lowercase header names
-            limit = response.headers.get('x-ratelimit-requests-limit', 'N/A')
-            remaining = response.headers.get('x-ratelimit-requests-remaining', 'N/A')
-            reset = response.headers.get('x-ratelimit-requests-reset', 'N/A')
-            
-            # Store for later retrieval
-            self.last_rate_limit = {
-                "limit": limit if limit != 'N/A' else None,
-                "remaining": remaining if remaining != 'N/A' else None,
-                "reset": reset if reset != 'N/A' else None
-            }
-            
-            if remaining != 'N/A':
-                logger.info(f"📊 RapidAPI Truth Social Rate Limit - Remaining: {remaining}/{limit}, Resets: {reset}")
-                
-                # Warn if approaching limit
-                if remaining != 'N/A' and limit != 'N/A':
-                    remaining_pct = (int(remaining) / int(limit)) * 100
-                    if remaining_pct < 10:
-                        logger.warning(f"⚠️ RapidAPI Truth Social rate limit low: {remaining_pct:.1f}% remaining!")
-        except Exception as e:
-            logger.debug(f"Could not parse rate limit headers: {e}")
+        # Feed endpoint and its fixed query parameters; only the limit varies
+        self._feed_url = f"{self.base_url}/users/{self.username}/feed"
+        self._feed_params = (("continue_from_id", "{}"),)
 
     def test_connection(self) -> bool:
         """Test RapidAPI connection."""
         try:
             # Test with a simple user feed lookup
-            url = f"{self.base_url}/users/{self.username}/feed"
-            params = {
-                "continue_from_id": "{}",
-                "limit": 1
-            }
+            params = self._feed_params + (("limit", 1),)
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=20)
+            response = self.session.get(self._feed_url, params=params, timeout=20)
             
             logger.info(f"Response status: {response.status_code}")
             logger.info(f"Response text: {response.text[:200]}...")
@@ -80,7 +45,7 @@ class TruthSocialRapidAPI:
             self._log_rate_limit(response)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 # The API returns a list directly
                 if isinstance(data, list) and len(data) > 0:
                     logger.info(f"✅ RapidAPI Truth Social connected. User: @{self.username}")
@@ -100,40 +65,26 @@ class TruthSocialRapidAPI:
         """Get recent posts from Trump's Truth Social account."""
         try:
             # Use the feed endpoint
-            url = f"{self.base_url}/users/{self.username}/feed"
-            params = {
-                "continue_from_id": "{}",
-                "limit": max_results
-            }
+            params = self._feed_params + (("limit", max_results),)
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=20)
+            response = self.session.get(self._feed_url, params=params, timeout=20)
             
             logger.info(f"Posts response status: {response.status_code}")
-            logger.info(f"Posts response text: {response.text[:200]}...")
+            # Preview only the first bytes; response.text would decode the whole body
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Posts response text: {response.content[:200].decode('utf-8', errors='replace')}...")
             self._log_rate_limit(response)
             
             # Check for rate limit error
             if response.status_code == 429:
-                logger.error(f"⚠️ RapidAPI Truth Social RATE LIMIT exceeded!")
-                logger.error(f"Rate limit will reset at: {self.last_rate_limit.get('reset', 'unknown')}")
-                
-                # Notify via Telegram if callback is available
-                try:
-                    from src.notifications.telegram_notifier import TelegramNotifier
-                    telegram = TelegramNotifier()
-                    telegram.notify_error({
-                        "type": "RateLimit",
-                        "message": f"Truth Social API rate limit exceeded. Resets at: {self.last_rate_limit.get('reset', 'unknown')}",
-                        "component": "Truth Social Monitor"
-                    })
-                except Exception as e:
-                    logger.debug(f"Could not send Telegram notification: {e}")
+                self._handle_rate_limited()
                 
                 # Return empty to avoid crashing, polling will continue
                 return []
             
             if response.status_code == 200:
-                data = response.json()
+                self._rate_limit_backoff = 0
+                data = _json_loads(response.content)
                 posts = []
                 
                 # The API returns a list directly
@@ -147,7 +98,7 @@ class TruthSocialRapidAPI:
                     # Extract plain text from HTML content
                     content = item.get("content", "")
                     # Simple HTML tag removal (for better text processing)
-                    text = re.sub(r'<[^>]+>', '', content)
+                    text = _TAG_RE.sub('', content) if '<' in content else content
                     
                     # Extract post data based on actual API response structure
                     post_dict = {
@@ -176,132 +127,19 @@ class TruthSocialRapidAPI:
             logger.error(f"Error retrieving recent posts: {e}")
             return []
 
-    def process_post(self, post_data: Dict) -> Optional[Dict]:
-        """Process a single post and store in database."""
-        try:
-            # Create content hash for deduplication
-            content_hash = hash_content(post_data["text"])
-            
-            # Check if post already exists
-            if self.db.post_exists(content_hash):
-                logger.debug(f"Post already exists: {content_hash[:8]}...")
-                return None
-            
-            # Prepare engagement metrics
-            engagement_metrics = json.dumps(post_data.get("public_metrics", {}))
-            
-            # Parse the created_at timestamp
-            try:
-                # Try ISO format first
-                if "T" in post_data["created_at"]:
-                    posted_at = datetime.fromisoformat(post_data["created_at"].replace("Z", "+00:00"))
-                else:
-                    # Try other common formats
-                    posted_at = datetime.strptime(post_data["created_at"], "%Y-%m-%d %H:%M:%S")
-                    posted_at = posted_at.replace(tzinfo=timezone.utc)
-            except (ValueError, AttributeError):
-                # Fallback to current time if parsing fails
-                posted_at = datetime.now(timezone.utc)
-            
-            # Store in database
-            post = self.db.create_post(
-                content_hash=content_hash,
-                platform=post_data["platform"],
-                content=post_data["text"],
-                posted_at=posted_at,
-                post_id=str(post_data["id"]),
-                engagement_metrics=engagement_metrics
-            )
-            
-            logger.info(f"✅ New Truth Social post stored: {post.id} - {post_data['text'][:50]}...")
-            
-            # Return processed data for sentiment analysis
-            return {
-                "post_id": post.id,
-                "platform": post_data["platform"],
-                "content": post_data["text"],
-                "external_id": str(post_data["id"]),
-                "created_at": post_data["created_at"]
-            }
-            
-        except Exception as e:
-            logger.error(f"Error processing post: {e}")
-            return None
-
-    def start_monitoring(self) -> None:
-        """Start monitoring using polling."""
-        logger.info("Starting Truth Social RapidAPI monitoring...")
-        
-        # Test connection first
-        if not self.test_connection():
-            logger.error("Cannot start monitoring - API connection failed")
-            return
-        
-        # Get only the most recent post first
-        recent_posts = self.get_recent_posts(max_results=1)
-        for post in recent_posts:
-            self.process_post(post)
-        
-        # Start polling monitoring
-        self.is_monitoring = True
-        self._start_polling_monitoring()
+    def fetch_latest(self, last_seen_id: Optional[str] = None) -> List[Dict]:
+        """Fetch the newest post from the feed."""
+        return self.get_recent_posts(max_results=1)
 
-    def _start_polling_monitoring(self) -> None:
-        """Start polling-based monitoring for posts."""
-        def polling_worker():
-            logger.info("🚀 Truth Social polling monitoring started - checking latest post every 30 seconds")
-            last_post_id = None
-            
-            while self.is_monitoring:
-                try:
-                    # Get only the most recent post
-                    posts = self.get_recent_posts(max_results=1)
-                    
-                    if posts:
-                        latest_post = posts[0]
-                        
-                        # Process only if this is a NEW post
-                        if last_post_id is None or latest_post["id"] != last_post_id:
-                            new_posts = [latest_post]
-                        else:
-                            new_posts = []
-                        
-                        # Process only new posts
-                        for post in new_posts:
-                            processed = self.process_post(post)
-                            if processed and self.on_new_post:
-                                self.on_new_post(processed)
-                        
-                        # Update last post ID
-                        if posts:
-                            last_post_id = posts[0]["id"]
-                    
-                    # Wait 30 seconds before next check (same as Twitter)
-                    time.sleep(30)
-                    
-                except Exception as e:
-                    logger.error(f"Error in polling monitoring: {e}")
-                    time.sleep(30)  # Wait before retrying
+    def _parse_posted_at(self, created_at: str) -> datetime:
+        """Parse an ISO timestamp, or "%Y-%m-%d %H:%M:%S" assumed to be UTC."""
+        # Try ISO format first
+        if "T" in created_at:
+            return datetime.fromisoformat(created_at.replace("Z", "+00:00"))
         
-        # Start polling in a separate thread
-        polling_thread = threading.Thread(target=polling_worker, name="TruthSocialPolling")
-        polling_thread.daemon = True
-        polling_thread.start()
-
-    def stop_monitoring(self) -> None:
-        """Stop monitoring."""
-        self.is_monitoring = False
-        logger.info("Truth Social monitoring stopped")
-
-    def get_monitoring_status(self) -> Dict:
-        """Get current monitoring status."""
-        return {
-            "monitoring": self.is_monitoring,
-            "platform": "TRUTH_SOCIAL",
-            "method": "RapidAPI Polling",
-            "real_time": False,
-            "polling_interval": "30 seconds",
-            "last_check": get_timestamp(),
-            "rate_limit": self.last_rate_limit
-        }
+        # Try other common formats
+        return datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
 
+    def process_post(self, post_data: Dict) -> Optional[Dict]:
+        """Process a single post and store in database."""
+        return self.process_item(post_data)
@@ -2,31 +2,232 @@
 
 import json
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
+
+try:
+    import orjson
+    _json_dumps_bytes = orjson.dumps
+except ImportError:
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from config.settings import settings
-from src.utils import format_currency, setup_logger
+from config.settings import get_settings
+from src.utils import format_currency, format_utc_timestamp, parse_twitter_timestamp, setup_logger
 
 logger = setup_logger(__name__)
 
+# sendMessage bodies are pre-encoded, so the content type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Keep-alive pool for Bot API calls. Notifications arrive in bursts (new post,
+# sentiment, trade), so reusing the TLS connection saves a handshake on each.
+HTTP_POOL_CONNECTIONS = 2
+HTTP_POOL_MAXSIZE = 10
+
+
+class _SendSafeRetry(Retry):
+    """
+    Retry policy that never re-sends a message Telegram may have delivered.
+
+    sendMessage is not idempotent: a gateway error can arrive after the
+    message went out, so status retries are limited to GET. A POST is only
+    retried where it cannot have been processed, i.e. connect errors (which
+    urllib3 retries for any method) and 429, honouring Retry-After.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST":
+            return status_code == 429 and bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+HTTP_RETRY = _SendSafeRetry(
+    total=2,
+    backoff_factor=0.2,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=("GET",),
+    raise_on_status=False,
+)
+
+# Trade execution message, filled in with str.format; simulated and live
+# trades differ only in the header and the closing warning
+_TRADE_TEMPLATE = """🎯 <b>{header}</b>
+
+🆔 <b>Order ID:</b> {order_id}
+{side_emoji} <b>Position:</b> {side_text} {leverage}x
+📊 <b>Size:</b> {formatted_size}
+💵 <b>Notional Value:</b> {formatted_value}
+
+💰 <b>PRICING:</b>
+   Entry Price: {formatted_price}
+   Stop Loss: ${stop_loss_price:,.2f} ({stop_loss_pct:.1f}% away)
+   Trailing Stop: {trailing_stop_text}
+
+🛡️ <b>RISK MANAGEMENT:</b>
+   Fixed Stop-Loss: 1% max loss
+   Trailing Rate: {trailing_callback_rate:.1f}% callback
+
+💸 <b>Estimated Fees:</b> ${fees:.4f}
+📈 <b>Sentiment Score:</b> {sentiment_score}/10
+
+{footer}"""
+
+_TRADE_SIMULATED_HEADER = "DRY RUN: TRADE EXECUTED"
+_TRADE_SIMULATED_FOOTER = "⚠️ <b>SIMULATED TRADE - NO REAL MONEY AT RISK</b>"
+_TRADE_LIVE_HEADER = "LIVE TRADE EXECUTED"
+_TRADE_LIVE_FOOTER = "🚨 <b>LIVE TRADE - REAL MONEY AT RISK</b>"
+
+# Trading settings never change at runtime, so the message is built once
+_TRADING_SETTINGS_TEXT = """⚙️ <b>TRADING SETTINGS</b>
+
+📊 <b>LEVERAGE MAP BY SENTIMENT SCORE:</b>
+
+<b>SHORT POSITIONS (Score &lt; 5):</b>
+   0 → 50x (Extreme Bearish)
+   1 → 30x (Very Bearish)
+   2 → 15x (Bearish)
+   3 → 10x (Moderately Bearish)
+   4 → 3x (Slightly Bearish)
+
+<b>NEUTRAL (Score = 5):</b>
+   5 → 0x (No Position)
+
+<b>LONG POSITIONS (Score &gt; 5):</b>
+   6 → 3x (Slightly Bullish)
+   7 → 10x (Moderately Bullish)
+   8 → 15x (Bullish)
+   9 → 30x (Very Bullish)
+   10 → 50x (Extreme Bullish)
+
+🛡️ <b>RISK MANAGEMENT:</b>
+
+<b>Fixed Stop Loss:</b>
+   • Maximum: 1% loss from entry
+   • Always active on all positions
+   • Triggers if price moves against you
+
+<b>Trailing Stop:</b>
+   • Leverage-based callback rates:
+     - 50x leverage → 0.5% callback
+     - 30x leverage → 0.75% callback
+     - 15x leverage → 1.0% callback
+     - 10x leverage → 1.5% callback
+     - 3x leverage → 2.0% callback
+   • Maximum: 2% callback rate
+   • Follows price in your favor
+   • Locks in profits automatically
+
+💡 <b>TRADING LOGIC:</b>
+   • Only ONE position at a time
+   • Uses ALL available liquidity
+   • Auto-executes based on sentiment
+   • Position closes via trailing stop
+
+🔍 <b>MONITORING:</b>
+   • Twitter: @realDonaldTrump
+   • Poll interval: 30 seconds
+   • AI Analysis: Claude Sonnet
+   • Auto-trade: Enabled
+
+"""
+
+
+# Inline keyboards are identical on every send, so they are shared constants.
+# Treat them as read-only.
+_KB_MAIN_MENU_ONLY = {
+    "inline_keyboard": [
+        [{"text": "🏠 Main Menu", "callback_data": "get_main_menu"}]
+    ]
+}
+
+_KB_CLOSE_CONFIRM = {
+    "inline_keyboard": [
+        [{"text": "✅ YES, CLOSE NOW!", "callback_data": "close_position_execute"}],
+        [{"text": "❌ NO, KEEP IT OPEN", "callback_data": "close_position_cancel"}]
+    ]
+}
+
+_KB_POS_STATUS_EMPTY = {
+    "inline_keyboard": [
+        [{"text": "🔄 Refresh Position", "callback_data": "refresh_position"}],
+        [{"text": "🏠 Main Menu", "callback_data": "get_main_menu"}]
+    ]
+}
+
+_KB_POS_STATUS_OPEN = {
+    "inline_keyboard": [
+        [{"text": "🔄 Refresh Position", "callback_data": "refresh_position"}],
+        [{"text": "❌ Close Position", "callback_data": "close_position_confirm"}],
+        [{"text": "🏠 Main Menu", "callback_data": "get_main_menu"}]
+    ]
+}
+
+_KB_STARTUP = {
+    "inline_keyboard": [
+        [{"text": "📊 Position Details", "callback_data": "get_position"}],
+        [{"text": "⚙️ Trading Settings", "callback_data": "get_trading_settings"}],
+        [{"text": "🔄 Refresh Data", "callback_data": "refresh_main_menu"}]
+    ]
+}
+
+# The Bot API takes reply_markup as a JSON-serialized string, so the static
+# keyboards are encoded once here rather than on every send
+_KB_MAIN_MENU_ONLY_JSON = json.dumps(_KB_MAIN_MENU_ONLY, separators=(",", ":"))
+_KB_CLOSE_CONFIRM_JSON = json.dumps(_KB_CLOSE_CONFIRM, separators=(",", ":"))
+_KB_POS_STATUS_EMPTY_JSON = json.dumps(_KB_POS_STATUS_EMPTY, separators=(",", ":"))
+_KB_POS_STATUS_OPEN_JSON = json.dumps(_KB_POS_STATUS_OPEN, separators=(",", ":"))
+_KB_STARTUP_JSON = json.dumps(_KB_STARTUP, separators=(",", ":"))
+
+
+# Message decorations keyed by sign (1 positive, -1 negative, 0 zero)
+_SENTIMENT_BANDS = {
+    1: ("🟢", "BULLISH", "LONG Signal"),
+    -1: ("🔴", "BEARISH", "SHORT Signal"),
+    0: ("🟡", "NEUTRAL", "No Action"),
+}
+_CLOSE_STATUS = {1: ("✅", "PROFIT"), -1: ("❌", "LOSS"), 0: ("⚪", "BREAKEVEN")}
+_PNL_EMOJI = {1: "🟢", -1: "🔴", 0: "🟡"}
+_PRICE_EMOJI = {1: "📈", -1: "📉", 0: "➖"}
+_FUNDING_EMOJI = {1: "📈", -1: "📉", 0: "⚪"}
+
+
+def _sign(value: float) -> int:
+    """Return 1, -1 or 0 for the sign of value."""
+    return (value > 0) - (value < 0)
+
+
+def _fmt_utc_now() -> str:
+    """Current time as 'YYYY-MM-DD HH:MM:SS UTC' for message footers."""
+    return format_utc_timestamp(datetime.now(timezone.utc))
+
 
 class TelegramNotifier:
     """Telegram notification system."""
 
     def __init__(self):
         """Initialize Telegram notifier."""
+        settings = get_settings()
         self.bot_token = settings.telegram_bot_token
         self.channel_id = settings.telegram_channel_id
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
         
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=HTTP_RETRY,
+        ))
+        
         logger.info("Telegram notifier initialized")
 
     def test_connection(self) -> bool:
         """Test Telegram bot connection."""
         try:
-            response = requests.get(f"{self.base_url}/getMe", timeout=10)
+            response = self._session.get(f"{self.base_url}/getMe", timeout=10)
             
             if response.status_code == 200:
                 bot_info = response.json()
@@ -44,14 +245,14 @@ class TelegramNotifier:
             logger.error(f"❌ Telegram connection failed: {e}")
             return False
 
-    def send_message(self, text: str, parse_mode: str = "HTML", reply_markup: Dict = None) -> bool:
+    def send_message(self, text: str, parse_mode: str = "HTML", reply_markup: Union[Dict, str] = None) -> bool:
         """
         Send a message to the Telegram channel.
 
         Args:
             text: Message text
             parse_mode: Parse mode (HTML or Markdown)
-            reply_markup: Inline keyboard markup
+            reply_markup: Inline keyboard markup, as a dict or pre-serialized JSON string
 
         Returns:
             True if successful
@@ -65,11 +266,14 @@ class TelegramNotifier:
             }
             
             if reply_markup:
+                if not isinstance(reply_markup, str):
+                    reply_markup = json.dumps(reply_markup, separators=(",", ":"))
                 data["reply_markup"] = reply_markup
             
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/sendMessage",
-                json=data,
+                data=_json_dumps_bytes(data),
+                headers=_JSON_HEADERS,
                 timeout=10
             )
             
@@ -108,7 +312,7 @@ class TelegramNotifier:
             if isinstance(posted_at, str):
                 posted_at = datetime.fromisoformat(posted_at.replace("Z", "+00:00"))
             
-            timestamp = posted_at.strftime("%Y-%m-%d %H:%M:%S UTC")
+            timestamp = format_utc_timestamp(posted_at)
             
             # Show full content (Telegram supports up to 4096 characters)
             if len(content) > 4000:
@@ -155,21 +359,23 @@ class TelegramNotifier:
                 try:
                     # Try ISO format first (Truth Social)
                     if "T" in created_at:
-                        posted_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+                        if created_at.endswith("Z"):
+                            created_at = created_at[:-1] + "+00:00"
+                        posted_at = datetime.fromisoformat(created_at)
                     else:
                         # Try Twitter format: "Tue Oct 14 17:20:04 +0000 2025"
-                        posted_at = datetime.strptime(created_at, "%a %b %d %H:%M:%S %z %Y")
+                        posted_at = parse_twitter_timestamp(created_at)
                 except (ValueError, AttributeError):
                     # Fallback to current time
                     posted_at = datetime.now(timezone.utc)
             else:
                 posted_at = created_at
             
-            post_timestamp = posted_at.strftime("%Y-%m-%d %H:%M:%S UTC")
+            post_timestamp = format_utc_timestamp(posted_at)
             
             # Calculate processing time
             now = datetime.now(timezone.utc)
-            processing_timestamp = now.strftime("%Y-%m-%d %H:%M:%S UTC")
+            processing_timestamp = format_utc_timestamp(now)
             
             # Calculate delay
             delay_seconds = (now - posted_at).total_seconds()
@@ -185,18 +391,7 @@ class TelegramNotifier:
                 content = content[:3000] + "..."
             
             # Determine sentiment emoji and action
-            if score > 5:
-                sentiment_emoji = "🟢"
-                sentiment_text = "BULLISH"
-                action_text = "LONG Signal"
-            elif score < 5:
-                sentiment_emoji = "🔴"
-                sentiment_text = "BEARISH"
-                action_text = "SHORT Signal"
-            else:
-                sentiment_emoji = "🟡"
-                sentiment_text = "NEUTRAL"
-                action_text = "No Action"
+            sentiment_emoji, sentiment_text, action_text = _SENTIMENT_BANDS[_sign(score - 5)]
             
             # Create message
             message = f"""🚨 <b>NEW {platform} POST</b>
@@ -238,15 +433,7 @@ class TelegramNotifier:
             content = sentiment_data["content"]
             
             # Determine sentiment emoji and color
-            if score > 5:
-                emoji = "🟢"
-                sentiment_text = "BULLISH"
-            elif score < 5:
-                emoji = "🔴"
-                sentiment_text = "BEARISH"
-            else:
-                emoji = "🟡"
-                sentiment_text = "NEUTRAL"
+            emoji, sentiment_text, _ = _SENTIMENT_BANDS[_sign(score - 5)]
             
             # Truncate content if too long
             if len(content) > 300:
@@ -321,47 +508,26 @@ class TelegramNotifier:
             
             # Create message
             if simulated:
-                message = f"""🎯 <b>DRY RUN: TRADE EXECUTED</b>
-
-🆔 <b>Order ID:</b> {order_id}
-{side_emoji} <b>Position:</b> {side_text} {leverage}x
-📊 <b>Size:</b> {formatted_size}
-💵 <b>Notional Value:</b> {formatted_value}
-
-💰 <b>PRICING:</b>
-   Entry Price: {formatted_price}
-   Stop Loss: ${stop_loss_price:,.2f} ({stop_loss_pct:.1f}% away)
-   Trailing Stop: {trailing_stop_text}
-
-🛡️ <b>RISK MANAGEMENT:</b>
-   Fixed Stop-Loss: 1% max loss
-   Trailing Rate: {trailing_callback_rate:.1f}% callback
-
-💸 <b>Estimated Fees:</b> ${fees:.4f}
-📈 <b>Sentiment Score:</b> {sentiment_score}/10
-
-⚠️ <b>SIMULATED TRADE - NO REAL MONEY AT RISK</b>"""
+                header, footer = _TRADE_SIMULATED_HEADER, _TRADE_SIMULATED_FOOTER
             else:
-                message = f"""🎯 <b>LIVE TRADE EXECUTED</b>
-
-🆔 <b>Order ID:</b> {order_id}
-{side_emoji} <b>Position:</b> {side_text} {leverage}x
-📊 <b>Size:</b> {formatted_size}
-💵 <b>Notional Value:</b> {formatted_value}
-
-💰 <b>PRICING:</b>
-   Entry Price: {formatted_price}
-   Stop Loss: ${stop_loss_price:,.2f} ({stop_loss_pct:.1f}% away)
-   Trailing Stop: {trailing_stop_text}
-
-🛡️ <b>RISK MANAGEMENT:</b>
-   Fixed Stop-Loss: 1% max loss
-   Trailing Rate: {trailing_callback_rate:.1f}% callback
-
-💸 <b>Estimated Fees:</b> ${fees:.4f}
-📈 <b>Sentiment Score:</b> {sentiment_score}/10
-
-🚨 <b>LIVE TRADE - REAL MONEY AT RISK</b>"""
+                header, footer = _TRADE_LIVE_HEADER, _TRADE_LIVE_FOOTER
+            message = _TRADE_TEMPLATE.format(
+                header=header,
+                footer=footer,
+                order_id=order_id,
+                side_emoji=side_emoji,
+                side_text=side_text,
+                leverage=leverage,
+                formatted_size=formatted_size,
+                formatted_value=formatted_value,
+                formatted_price=formatted_price,
+                stop_loss_price=stop_loss_price,
+                stop_loss_pct=stop_loss_pct,
+                trailing_stop_text=trailing_stop_text,
+                trailing_callback_rate=trailing_callback_rate,
+                fees=fees,
+                sentiment_score=sentiment_score,
+            )
 
             return self.send_message(message)
             
@@ -386,12 +552,7 @@ class TelegramNotifier:
             pnl_usd = update_data["pnl_usd"]
             
             # Determine PnL emoji
-            if pnl_percentage > 0:
-                pnl_emoji = "🟢"
-            elif pnl_percentage < 0:
-                pnl_emoji = "🔴"
-            else:
-                pnl_emoji = "🟡"
+            pnl_emoji = _PNL_EMOJI[_sign(pnl_percentage)]
             
             # Format values
             formatted_price = format_currency(current_price)
@@ -404,7 +565,7 @@ class TelegramNotifier:
 💰 <b>Current Price:</b> {formatted_price}
 {pnl_emoji} <b>PnL:</b> {pnl_percentage:+.2f}% ({formatted_pnl})
 
-⏰ <b>Time:</b> {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}"""
+⏰ <b>Time:</b> {_fmt_utc_now()}"""
 
             return self.send_message(message)
             
@@ -442,18 +603,9 @@ class TelegramNotifier:
             opened_at = close_data.get("opened_at", "Unknown")
             
             # Determine result emoji and status
-            if pnl_percentage > 0:
-                status_emoji = "✅"
-                status_text = "PROFIT"
-                pnl_emoji = "🟢"
-            elif pnl_percentage < 0:
-                status_emoji = "❌"
-                status_text = "LOSS"
-                pnl_emoji = "🔴"
-            else:
-                status_emoji = "⚪"
-                status_text = "BREAKEVEN"
-                pnl_emoji = "🟡"
+            pnl_sign = _sign(pnl_percentage)
+            status_emoji, status_text = _CLOSE_STATUS[pnl_sign]
+            pnl_emoji = _PNL_EMOJI[pnl_sign]
             
             # Format close reason
             reason_display = close_reason.replace("_", " ").title()
@@ -468,7 +620,7 @@ class TelegramNotifier:
             total_commission = entry_fee + exit_fee
             
             # Format funding fee emoji
-            funding_emoji = '📈' if funding_fee > 0 else '📉' if funding_fee < 0 else '⚪'
+            funding_emoji = _FUNDING_EMOJI[_sign(funding_fee)]
             
             # Calculate margin (for ROI percentage)
             margin = notional_value / leverage if leverage > 0 else notional_value
@@ -507,7 +659,7 @@ class TelegramNotifier:
 🔄 <b>Close Reason:</b> {reason_display}
 
 ⏰ <b>Opened:</b> {opened_at}
-🏁 <b>Closed:</b> {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}
+🏁 <b>Closed:</b> {_fmt_utc_now()}
 
 """
             
@@ -558,12 +710,7 @@ This action cannot be undone! The position will be closed at market price.
 
 Choose wisely:"""
 
-            return self.send_message(message, reply_markup={
-                "inline_keyboard": [
-                    [{"text": "✅ YES, CLOSE NOW!", "callback_data": "close_position_execute"}],
-                    [{"text": "❌ NO, KEEP IT OPEN", "callback_data": "close_position_cancel"}]
-                ]
-            })
+            return self.send_message(message, reply_markup=_KB_CLOSE_CONFIRM_JSON)
             
         except Exception as e:
             logger.error(f"Error sending close confirmation: {e}")
@@ -591,7 +738,7 @@ Choose wisely:"""
 ⚠️ <b>Type:</b> {error_type}
 📝 <b>Message:</b> {error_message}
 
-⏰ <b>Time:</b> {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}
+⏰ <b>Time:</b> {_fmt_utc_now()}
 
 🛠️ <b>Action Required:</b> Check logs and system status"""
 
@@ -619,12 +766,7 @@ Choose wisely:"""
 
 """
                 
-                return self.send_message(message, reply_markup={
-                    "inline_keyboard": [
-                        [{"text": "🔄 Refresh Position", "callback_data": "refresh_position"}],
-                        [{"text": "🏠 Main Menu", "callback_data": "get_main_menu"}]
-                    ]
-                })
+                return self.send_message(message, reply_markup=_KB_POS_STATUS_EMPTY_JSON)
             
             # Format position data (basic info from our database)
             side = position_data.get("side", "UNKNOWN")
@@ -659,12 +801,7 @@ Choose wisely:"""
             price_change_pct = (price_change / entry_price) * 100
             
             # Determine price change emoji
-            if price_change_pct > 0:
-                price_emoji = "📈"
-            elif price_change_pct < 0:
-                price_emoji = "📉"
-            else:
-                price_emoji = "➖"
+            price_emoji = _PRICE_EMOJI[_sign(price_change_pct)]
             
             # Use actual trailing stop price from Binance if available, otherwise calculate
             if trailing_stop_price_from_binance:
@@ -688,12 +825,7 @@ Choose wisely:"""
             stop_loss_distance = abs(stop_loss_price - current_price) / current_price * 100 if stop_loss_price > 0 else 0
             
             # Determine position emoji
-            if pnl_percentage > 0:
-                pnl_emoji = "🟢"
-            elif pnl_percentage < 0:
-                pnl_emoji = "🔴"
-            else:
-                pnl_emoji = "🟡"
+            pnl_emoji = _PNL_EMOJI[_sign(pnl_percentage)]
             
             message = f"""📊 <b>POSITION STATUS</b>
 
@@ -724,20 +856,14 @@ Choose wisely:"""
 
 💸 <b>FEES & FUNDING:</b>
    Trading Fees: ${fees:.4f}
-   Funding Fee: ${funding_fee:+.4f} {'📈' if funding_fee > 0 else '📉' if funding_fee < 0 else '⚪'}
+   Funding Fee: ${funding_fee:+.4f} {_FUNDING_EMOJI[_sign(funding_fee)]}
 
 ⏰ <b>Opened:</b> {created_at}
-🕐 <b>Updated:</b> {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}
+🕐 <b>Updated:</b> {_fmt_utc_now()}
 
 """
             
-            return self.send_message(message, reply_markup={
-                "inline_keyboard": [
-                    [{"text": "🔄 Refresh Position", "callback_data": "refresh_position"}],
-                    [{"text": "❌ Close Position", "callback_data": "close_position_confirm"}],
-                    [{"text": "🏠 Main Menu", "callback_data": "get_main_menu"}]
-                ]
-            })
+            return self.send_message(message, reply_markup=_KB_POS_STATUS_OPEN_JSON)
             
         except Exception as e:
             logger.error(f"Error notifying position status: {e}")
@@ -751,64 +877,7 @@ Choose wisely:"""
             True if successful
         """
         try:
-            message = """⚙️ <b>TRADING SETTINGS</b>
-
-📊 <b>LEVERAGE MAP BY SENTIMENT SCORE:</b>
-
-<b>SHORT POSITIONS (Score &lt; 5):</b>
-   0 → 50x (Extreme Bearish)
-   1 → 30x (Very Bearish)
-   2 → 15x (Bearish)
-   3 → 10x (Moderately Bearish)
-   4 → 3x (Slightly Bearish)
-
-<b>NEUTRAL (Score = 5):</b>
-   5 → 0x (No Position)
-
-<b>LONG POSITIONS (Score &gt; 5):</b>
-   6 → 3x (Slightly Bullish)
-   7 → 10x (Moderately Bullish)
-   8 → 15x (Bullish)
-   9 → 30x (Very Bullish)
-   10 → 50x (Extreme Bullish)
-
-🛡️ <b>RISK MANAGEMENT:</b>
-
-<b>Fixed Stop Loss:</b>
-   • Maximum: 1% loss from entry
-   • Always active on all positions
-   • Triggers if price moves against you
-
-<b>Trailing Stop:</b>
-   • Leverage-based callback rates:
-     - 50x leverage → 0.5% callback
-     - 30x leverage → 0.75% callback
-     - 15x leverage → 1.0% callback
-     - 10x leverage → 1.5% callback
-     - 3x leverage → 2.0% callback
-   • Maximum: 2% callback rate
-   • Follows price in your favor
-   • Locks in profits automatically
-
-💡 <b>TRADING LOGIC:</b>
-   • Only ONE position at a time
-   • Uses ALL available liquidity
-   • Auto-executes based on sentiment
-   • Position closes via trailing stop
-
-🔍 <b>MONITORING:</b>
-   • Twitter: @realDonaldTrump
-   • Poll interval: 30 seconds
-   • AI Analysis: Claude Sonnet
-   • Auto-trade: Enabled
-
-"""
-            
-            return self.send_message(message, reply_markup={
-                "inline_keyboard": [
-                    [{"text": "🏠 Main Menu", "callback_data": "get_main_menu"}]
-                ]
-            })
+            return self.send_message(_TRADING_SETTINGS_TEXT, reply_markup=_KB_MAIN_MENU_ONLY_JSON)
             
         except Exception as e:
             logger.error(f"Error notifying trading settings: {e}")
@@ -907,17 +976,11 @@ Choose wisely:"""
 🤖 <b>AI Analysis:</b> Claude 3.5 Sonnet
 📱 <b>Notifications:</b> Telegram{rate_limit_text}
 
-⏰ <b>Started:</b> {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}
+⏰ <b>Started:</b> {_fmt_utc_now()}
 
 """
 
-            return self.send_message(message, reply_markup={
-                "inline_keyboard": [
-                    [{"text": "📊 Position Details", "callback_data": "get_position"}],
-                    [{"text": "⚙️ Trading Settings", "callback_data": "get_trading_settings"}],
-                    [{"text": "🔄 Refresh Data", "callback_data": "refresh_main_menu"}]
-                ]
-            })
+            return self.send_message(message, reply_markup=_KB_STARTUP_JSON)
             
         except Exception as e:
             logger.error(f"Error notifying startup: {e}")
@@ -929,8 +992,8 @@ Choose wisely:"""
             message = f"""🤖 <b>TRUMP TRADER BOT</b>
 
 ✅ <b>Status:</b> Online and ready
-⏰ <b>Time:</b> {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}
-🔧 <b>Mode:</b> {'TESTNET' if settings.binance_testnet else 'LIVE TRADING'}
+⏰ <b>Time:</b> {_fmt_utc_now()}
+🔧 <b>Mode:</b> {'TESTNET' if get_settings().binance_testnet else 'LIVE TRADING'}
 
 🚀 <b>System:</b> All systems operational"""
 
@@ -7,7 +7,7 @@ from typing import Dict, List, Optional, Tuple
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
-from config.settings import settings
+from config.settings import get_settings
 from src.utils import setup_logger
 
 logger = setup_logger(__name__)
@@ -18,6 +18,7 @@ class BinanceClient:
 
     def __init__(self):
         """Initialize Binance client."""
+        settings = get_settings()
         self.client = Client(
             api_key=settings.active_binance_api_key,
             api_secret=settings.active_binance_api_secret,
@@ -520,7 +521,7 @@ class BinanceClient:
                 "open_positions": positions,
                 "current_price": price,
                 "symbol": self.symbol,
-                "testnet": settings.binance_testnet
+                "testnet": get_settings().binance_testnet
             }
             
         except Exception as e:
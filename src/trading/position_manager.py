@@ -3,8 +3,8 @@
 import time
 from typing import Dict, List, Optional, Tuple
 
-from config.settings import settings
-from src.database.repository import DatabaseRepository
+from config.settings import get_settings
+from src.database.repository import get_repository
 from src.database.models import Trade
 from src.trading.binance_client import BinanceClient
 from src.utils import (
@@ -25,7 +25,7 @@ class PositionManager:
     def __init__(self):
         """Initialize position manager."""
         self.binance = BinanceClient()
-        self.db = DatabaseRepository()
+        self.db = get_repository()
         
         logger.info("Position manager initialized")
 
@@ -126,7 +126,7 @@ class PositionManager:
         """
         try:
             # Check if we're in dry run mode
-            if settings.binance_testnet:
+            if get_settings().binance_testnet:
                 logger.info("DRY RUN MODE - Simulating trade execution")
                 return self._simulate_trade(trade_params, sentiment_id)
             
@@ -204,6 +204,7 @@ class PositionManager:
             
             return {
                 "trade_id": trade.id,
+                "trade": trade,
                 "side": binance_side,  # Use BUY/SELL for consistency
                 "leverage": trade_params['leverage'],
                 "entry_price": trade_params['current_price'],
@@ -247,6 +248,7 @@ class PositionManager:
             
             return {
                 "trade_id": trade.id,
+                "trade": trade,
                 "side": trade_params['side'],
                 "leverage": trade_params['leverage'],
                 "entry_price": trade_params['current_price'],
@@ -278,7 +280,7 @@ class PositionManager:
         try:
             # Get trade from database
             with self.db.get_session() as session:
-                trade = session.query(Trade).filter_by(id=trade_id).first()
+                trade = session.get(Trade, trade_id)
                 
                 if not trade:
                     logger.error(f"Trade {trade_id} not found")
@@ -288,7 +290,7 @@ class PositionManager:
                     logger.info(f"Trade {trade_id} already closed")
                     return True
             
-            if settings.binance_testnet:
+            if get_settings().binance_testnet:
                 # Simulate closing
                 logger.info(f"DRY RUN: Closing trade {trade_id}")
                 self.db.close_trade(
@@ -373,7 +375,7 @@ class PositionManager:
                     "entry_price": open_trade.entry_price if open_trade else None,
                     "opened_at": open_trade.opened_at.isoformat() if open_trade else None
                 } if open_trade else None,
-                "testnet_mode": settings.binance_testnet
+                "testnet_mode": get_settings().binance_testnet
             }
             
         except Exception as e:
@@ -3,11 +3,13 @@
 from src.utils.helpers import (
     calculate_pnl_percentage,
     format_currency,
+    format_utc_timestamp,
     get_callback_rate_for_leverage,
     get_leverage_for_score,
     get_position_side,
     get_timestamp,
     hash_content,
+    parse_twitter_timestamp,
     should_open_position,
 )
 from src.utils.logger import setup_logger
@@ -17,6 +19,8 @@ __all__ = [
     "hash_content",
     "get_timestamp",
     "format_currency",
+    "format_utc_timestamp",
+    "parse_twitter_timestamp",
     "calculate_pnl_percentage",
     "get_leverage_for_score",
     "get_callback_rate_for_leverage",
@@ -37,6 +37,59 @@ def format_currency(amount: float, decimals: int = 2) -> str:
     return f"${amount:,.{decimals}f}"
 
 
+def format_utc_timestamp(dt: datetime) -> str:
+    """
+    Format a timestamp as 'YYYY-MM-DD HH:MM:SS UTC'.
+
+    Uses isoformat rather than strftime, which is considerably faster.
+    Naive datetimes are assumed to already be in UTC.
+
+    Args:
+        dt: Timestamp to format
+
+    Returns:
+        Formatted timestamp string
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return f"{dt.isoformat(sep=' ', timespec='seconds')} UTC"
+
+
+# Month abbreviations in Twitter's created_at format
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+def parse_twitter_timestamp(value: str) -> datetime:
+    """
+    Parse Twitter's created_at format, e.g. "Tue Oct 14 17:20:04 +0000 2025".
+
+    The API always sends fixed-width UTC timestamps, so they are sliced
+    directly; anything else goes through strptime.
+
+    Args:
+        value: Timestamp string from the API
+
+    Returns:
+        Timezone-aware datetime
+
+    Raises:
+        ValueError: If the timestamp cannot be parsed
+    """
+    if len(value) == 30 and value[20:25] == "+0000" and value[4:7] in _MONTHS:
+        try:
+            return datetime(
+                int(value[26:30]), _MONTHS[value[4:7]], int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19]),
+                tzinfo=timezone.utc,
+            )
+        except ValueError:
+            pass
+    return datetime.strptime(value, "%a %b %d %H:%M:%S %z %Y")
+
+
 def calculate_pnl_percentage(entry_price: float, exit_price: float, side: str, leverage: int = 1) -> float:
     """
     Calculate profit/loss percentage with leverage applied.
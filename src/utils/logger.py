@@ -5,7 +5,7 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-from config.settings import settings
+from config.settings import get_settings
 
 
 def setup_logger(
@@ -23,7 +23,7 @@ def setup_logger(
         Configured logger instance
     """
     logger = logging.getLogger(name)
-    log_level = getattr(logging, level or settings.log_level)
+    log_level = getattr(logging, level or get_settings().log_level)
     logger.setLevel(log_level)
 
     # Remove existing handlers to avoid duplicates
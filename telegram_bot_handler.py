@@ -8,12 +8,12 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from typing import Dict, List
-from src.database.repository import DatabaseRepository
+from src.database.repository import get_repository
 from src.analysis.sentiment_analyzer import SentimentAnalyzer
 from src.trading.position_manager import PositionManager
 from src.notifications.telegram_notifier import TelegramNotifier
 from src.bot.trading_bot import TradingBot
-from config.settings import settings
+from config.settings import get_settings
 import requests
 import time
 import logging
@@ -27,12 +27,13 @@ class TelegramBotHandler:
     
     def __init__(self):
         """Initialize the bot handler."""
+        settings = get_settings()
         self.bot_token = settings.telegram_bot_token
         self.channel_id = settings.telegram_channel_id
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
         
         # Initialize trading bot components
-        self.db = DatabaseRepository()
+        self.db = get_repository()
         self.sentiment_analyzer = SentimentAnalyzer()
         self.position_manager = PositionManager()
         self.telegram = TelegramNotifier()
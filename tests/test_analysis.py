@@ -1,8 +1,9 @@
 """Tests for sentiment analysis."""
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import json
+import threading
 
 from src.analysis.sentiment_analyzer import SentimentAnalyzer
 
@@ -17,7 +18,7 @@ class TestSentimentAnalyzer:
         assert analyzer.db is not None
         assert analyzer.model_version == "claude-3-5-sonnet-20241022"
 
-    @patch('src.analysis.sentiment_analyzer.anthropic.Anthropic')
+    @patch('anthropic.Anthropic')
     def test_test_connection_success(self, mock_anthropic_class):
         """Test successful connection test."""
         # Mock client instance
@@ -35,7 +36,7 @@ class TestSentimentAnalyzer:
         assert result is True
         mock_client.messages.create.assert_called_once()
 
-    @patch('src.analysis.sentiment_analyzer.anthropic.Anthropic')
+    @patch('anthropic.Anthropic')
     def test_test_connection_failure(self, mock_anthropic_class):
         """Test failed connection test."""
         # Mock client instance
@@ -50,7 +51,7 @@ class TestSentimentAnalyzer:
         
         assert result is False
 
-    @patch('src.analysis.sentiment_analyzer.anthropic.Anthropic')
+    @patch('anthropic.Anthropic')
     def test_analyze_sentiment_success(self, mock_anthropic_class):
         """Test successful sentiment analysis."""
         # Mock client instance
@@ -69,7 +70,25 @@ class TestSentimentAnalyzer:
         assert reasoning == "Very bullish sentiment"
         mock_client.messages.create.assert_called_once()
 
-    @patch('src.analysis.sentiment_analyzer.anthropic.Anthropic')
+    @patch('anthropic.Anthropic')
+    def test_analyze_sentiment_markdown_fenced(self, mock_anthropic_class):
+        """Test sentiment analysis with JSON wrapped in a markdown fence."""
+        # Mock client instance
+        mock_client = Mock()
+        mock_anthropic_class.return_value = mock_client
+        
+        # Mock response wrapped in ```json ... ```
+        mock_response = Mock()
+        mock_response.content = [Mock(text='Here you go:\n```json\n{"score": 3, "reasoning": "Bearish"}\n```')]
+        mock_client.messages.create.return_value = mock_response
+        
+        analyzer = SentimentAnalyzer()
+        score, reasoning = analyzer.analyze_sentiment("Test post", "TWITTER")
+        
+        assert score == 3
+        assert reasoning == "Bearish"
+
+    @patch('anthropic.Anthropic')
     def test_analyze_sentiment_json_parse_error(self, mock_anthropic_class):
         """Test sentiment analysis with JSON parse error."""
         # Mock client instance
@@ -89,7 +108,46 @@ class TestSentimentAnalyzer:
         assert 0 <= score <= 10
         assert "Analysis failed" in reasoning
 
-    @patch('src.analysis.sentiment_analyzer.anthropic.Anthropic')
+    @patch('anthropic.Anthropic')
+    def test_analyze_sentiment_parse_failure_not_persisted(self, mock_anthropic_class):
+        """Test a guessed score from a non-JSON reply is not written to the database cache."""
+        mock_client = Mock()
+        mock_anthropic_class.return_value = mock_client
+        
+        mock_response = Mock()
+        mock_response.content = [Mock(text="I'd say 8/10")]
+        mock_client.messages.create.return_value = mock_response
+        
+        analyzer = SentimentAnalyzer()
+        analyzer.db = Mock()
+        analyzer.db.get_cached_sentiment.return_value = None
+        score, reasoning = analyzer.analyze_sentiment("Test post", "TWITTER")
+        
+        assert score == 8
+        assert "Analysis failed" in reasoning
+        analyzer.db.cache_sentiment.assert_not_called()
+
+    @patch('anthropic.Anthropic')
+    def test_analyze_sentiment_parse_failure_not_memoized(self, mock_anthropic_class):
+        """Test content whose reply could not be parsed is sent to Claude again."""
+        mock_client = Mock()
+        mock_anthropic_class.return_value = mock_client
+        
+        bad_response = Mock()
+        bad_response.content = [Mock(text="Invalid JSON response")]
+        good_response = Mock()
+        good_response.content = [Mock(text='{"score": 3, "reasoning": "Bearish"}')]
+        mock_client.messages.create.side_effect = [bad_response, good_response]
+        
+        analyzer = SentimentAnalyzer()
+        analyzer.db = Mock()
+        analyzer.db.get_cached_sentiment.return_value = None
+        analyzer.analyze_sentiment("Test post", "TWITTER")
+        
+        assert analyzer.analyze_sentiment("Test post", "TWITTER") == (3, "Bearish")
+        assert mock_client.messages.create.call_count == 2
+
+    @patch('anthropic.Anthropic')
     def test_analyze_sentiment_api_error(self, mock_anthropic_class):
         """Test sentiment analysis with API error."""
         # Mock client instance
@@ -106,6 +164,179 @@ class TestSentimentAnalyzer:
         assert score == 5
         assert "Analysis failed due to error" in reasoning
 
+    @patch('anthropic.Anthropic')
+    def test_analyze_sentiment_short_content(self, mock_anthropic_class):
+        """Test near-empty posts skip the API call."""
+        mock_client = Mock()
+        mock_anthropic_class.return_value = mock_client
+        
+        analyzer = SentimentAnalyzer()
+        score, reasoning = analyzer.analyze_sentiment("  ok ", "TWITTER")
+        
+        assert score == 5
+        assert "too short" in reasoning
+        mock_client.messages.create.assert_not_called()
+
+    @patch('anthropic.Anthropic')
+    def test_analyze_sentiment_cached(self, mock_anthropic_class):
+        """Test repeated content is served from the in-memory cache."""
+        mock_client = Mock()
+        mock_anthropic_class.return_value = mock_client
+        
+        mock_response = Mock()
+        mock_response.content = [Mock(text='{"score": 8, "reasoning": "Very bullish sentiment"}')]
+        mock_client.messages.create.return_value = mock_response
+        
+        analyzer = SentimentAnalyzer()
+        first = analyzer.analyze_sentiment("Test post", "TWITTER")
+        second = analyzer.analyze_sentiment("Test post", "TRUTH_SOCIAL")
+        
+        assert first == second == (8, "Very bullish sentiment")
+        mock_client.messages.create.assert_called_once()
+
+    @patch('anthropic.Anthropic')
+    def test_analyze_sentiment_hashes_content_once(self, mock_anthropic_class):
+        """Test one content digest keys both the in-memory and database caches."""
+        from src.utils import hash_content
+        
+        mock_client = Mock()
+        mock_anthropic_class.return_value = mock_client
+        
+        mock_response = Mock()
+        mock_response.content = [Mock(text='{"score": 7, "reasoning": "Bullish"}')]
+        mock_client.messages.create.return_value = mock_response
+        
+        analyzer = SentimentAnalyzer()
+        analyzer.db = Mock()
+        analyzer.db.get_cached_sentiment.return_value = None
+        
+        with patch('src.analysis.sentiment_analyzer.hash_content', wraps=hash_content) as mock_hash:
+            analyzer.analyze_sentiment("Test post", "TWITTER")
+        
+        mock_hash.assert_called_once_with("Test post")
+        key = hash_content("Test post")
+        analyzer.db.get_cached_sentiment.assert_called_once_with(key, analyzer.model_version)
+        analyzer.db.cache_sentiment.assert_called_once_with(key, analyzer.model_version, 7, "Bullish")
+        assert key in analyzer._analysis_cache
+
+    @patch('anthropic.Anthropic')
+    def test_analyze_sentiment_database_cache(self, mock_anthropic_class):
+        """Test results persisted by one analyzer are reused by a fresh one."""
+        from src.database.repository import DatabaseRepository
+        
+        mock_client = Mock()
+        mock_anthropic_class.return_value = mock_client
+        
+        mock_response = Mock()
+        mock_response.content = [Mock(text='{"score": 2, "reasoning": "Bearish"}')]
+        mock_client.messages.create.return_value = mock_response
+        
+        db = DatabaseRepository("sqlite://")
+        db.create_tables()
+        
+        first = SentimentAnalyzer()
+        first.db = db
+        assert first.analyze_sentiment("Tariffs on everything", "TWITTER") == (2, "Bearish")
+        
+        # A new analyzer starts with an empty in-memory cache
+        second = SentimentAnalyzer()
+        second.db = db
+        assert second.analyze_sentiment("Tariffs on everything", "TWITTER") == (2, "Bearish")
+        
+        mock_client.messages.create.assert_called_once()
+
+    @patch('anthropic.AsyncAnthropic')
+    def test_analyze_many(self, mock_async_anthropic_class):
+        """Test concurrent sentiment analysis of several posts."""
+        # Mock async client instance
+        mock_aclient = Mock()
+        mock_async_anthropic_class.return_value = mock_aclient
+        
+        # Mock one bullish and one bearish response
+        bullish = Mock()
+        bullish.content = [Mock(text='{"score": 8, "reasoning": "Bullish"}')]
+        bearish = Mock()
+        bearish.content = [Mock(text='{"score": 2, "reasoning": "Bearish"}')]
+        # Answer by prompt content, since concurrent calls may arrive in any order
+        mock_aclient.messages.create = AsyncMock(
+            side_effect=lambda **kwargs: bullish if "Great news" in kwargs["messages"][0]["content"] else bearish
+        )
+        
+        analyzer = SentimentAnalyzer()
+        results = analyzer.analyze_many([
+            {"content": "Great news", "platform": "TWITTER"},
+            {"content": "Bad news", "platform": "TRUTH_SOCIAL"},
+        ])
+        
+        assert results == [(8, "Bullish"), (2, "Bearish")]
+        assert mock_aclient.messages.create.await_count == 2
+
+    @patch('anthropic.AsyncAnthropic')
+    def test_analyze_many_database_cache_off_event_loop(self, mock_async_anthropic_class):
+        """Test async analyses read and write the database cache outside the event loop thread."""
+        mock_aclient = Mock()
+        mock_async_anthropic_class.return_value = mock_aclient
+        
+        response = Mock()
+        response.content = [Mock(text='{"score": 8, "reasoning": "Bullish"}')]
+        mock_aclient.messages.create = AsyncMock(return_value=response)
+        
+        db_threads = []
+        analyzer = SentimentAnalyzer()
+        analyzer.db = Mock()
+        analyzer.db.get_cached_sentiment.side_effect = lambda *args: db_threads.append(threading.get_ident())
+        analyzer.db.cache_sentiment.side_effect = lambda *args: db_threads.append(threading.get_ident())
+        
+        assert analyzer.analyze_many([{"content": "Great news", "platform": "TWITTER"}]) == [(8, "Bullish")]
+        
+        # The loop runs on this thread; both cache calls ran elsewhere
+        assert len(db_threads) == 2
+        assert threading.get_ident() not in db_threads
+
+    def test_analyze_many_empty(self):
+        """Test that an empty batch makes no API calls."""
+        analyzer = SentimentAnalyzer()
+        assert analyzer.analyze_many([]) == []
+
+    @patch('anthropic.AsyncAnthropic')
+    def test_process_posts_skips_existing(self, mock_async_anthropic_class):
+        """Test batch processing only analyzes posts without a stored sentiment."""
+        # Mock async client instance
+        mock_aclient = Mock()
+        mock_async_anthropic_class.return_value = mock_aclient
+        
+        mock_response = Mock()
+        mock_response.content = [Mock(text='{"score": 7, "reasoning": "Bullish"}')]
+        mock_aclient.messages.create = AsyncMock(return_value=mock_response)
+        
+        analyzer = SentimentAnalyzer()
+        analyzer.db = Mock()
+        analyzer.db.get_sentiments_by_post_ids.return_value = {
+            1: Mock(id=10, score=4, reasoning="Stored")
+        }
+        analyzer.db.create_sentiment.return_value = Mock(id=11)
+        analyzer.db.get_cached_sentiment.return_value = None
+        
+        results = analyzer.process_posts([
+            {"post_id": 1, "content": "Old post", "platform": "TWITTER"},
+            {"post_id": 2, "content": "New post", "platform": "TWITTER"},
+        ])
+        
+        analyzer.db.get_sentiments_by_post_ids.assert_called_once_with([1, 2])
+        analyzer.db.create_sentiment.assert_called_once()
+        assert mock_aclient.messages.create.await_count == 1
+        assert results[0] == {"sentiment_id": 10, "score": 4, "reasoning": "Stored"}
+        assert results[1]["sentiment_id"] == 11
+        assert results[1]["score"] == 7
+
+    def test_close(self):
+        """Test that close releases the pooled HTTP clients."""
+        analyzer = SentimentAnalyzer()
+        analyzer.close()
+        
+        assert analyzer._http_client.is_closed
+        assert analyzer._async_http_client.is_closed
+
     def test_extract_score_from_text(self):
         """Test score extraction from text."""
         analyzer = SentimentAnalyzer()
@@ -116,3 +347,77 @@ class TestSentimentAnalyzer:
         assert analyzer._extract_score_from_text("8") == 8
         assert analyzer._extract_score_from_text("No score here") == 5  # Default
 
+    def test_get_sentiment_summary(self):
+        """Test summary counts are aggregated from stored sentiments."""
+        from datetime import datetime, timezone
+        from src.database.repository import DatabaseRepository
+        
+        analyzer = SentimentAnalyzer()
+        analyzer.db = DatabaseRepository("sqlite://")
+        analyzer.db.create_tables()
+        
+        for i, score in enumerate([8, 2, 5, 9]):
+            post = analyzer.db.create_post(
+                content_hash=f"hash{i}",
+                platform="TWITTER",
+                content=f"Post {i}",
+                posted_at=datetime.now(timezone.utc)
+            )
+            analyzer.db.create_sentiment(post.id, score, "Reason", "test-model")
+        
+        summary = analyzer.get_sentiment_summary(hours=24, include_scores=True)
+        
+        assert summary["total_posts"] == 4
+        assert summary["average_score"] == 6.0
+        assert summary["bullish_posts"] == 2
+        assert summary["bearish_posts"] == 1
+        assert summary["neutral_posts"] == 1
+        assert sorted(summary["scores"]) == [2, 5, 8, 9]
+
+    def test_get_sentiment_summary_empty(self):
+        """Test summary defaults when no sentiments are stored."""
+        from src.database.repository import DatabaseRepository
+        
+        analyzer = SentimentAnalyzer()
+        analyzer.db = DatabaseRepository("sqlite://")
+        analyzer.db.create_tables()
+        
+        summary = analyzer.get_sentiment_summary(hours=24)
+        
+        assert summary["total_posts"] == 0
+        assert summary["average_score"] == 5.0
+        assert summary["scores"] == []
+        assert "scores" not in analyzer.get_sentiment_summary(hours=24, include_scores=False)
+
+    def test_get_sentiment_summary_cached(self):
+        """Test repeated summaries are served from cache until a new sentiment is stored."""
+        from datetime import datetime, timezone
+        from src.database.repository import DatabaseRepository
+        
+        analyzer = SentimentAnalyzer()
+        analyzer.db = DatabaseRepository("sqlite://")
+        analyzer.db.create_tables()
+        
+        first = analyzer.get_sentiment_summary(hours=24)
+        
+        with patch.object(analyzer.db, 'get_session') as mock_get_session:
+            second = analyzer.get_sentiment_summary(hours=24)
+            mock_get_session.assert_not_called()
+        
+        # Callers get a copy, so mutating it leaves the cached summary intact
+        assert second == first and second is not first
+        second["scores"].append(10)
+        second["total_posts"] = 99
+        assert analyzer.get_sentiment_summary(hours=24) == first
+        
+        # Storing a new sentiment invalidates the cache
+        post = analyzer.db.create_post(
+            content_hash="hash",
+            platform="TWITTER",
+            content="Post",
+            posted_at=datetime.now(timezone.utc)
+        )
+        with patch.object(analyzer, 'analyze_sentiment', return_value=(8, "Bullish")):
+            analyzer.process_post({"post_id": post.id, "content": "Post", "platform": "TWITTER"})
+        
+        assert analyzer.get_sentiment_summary(hours=24)["total_posts"] == 1
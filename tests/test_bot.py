@@ -1,10 +1,12 @@
 """Tests for the main trading bot."""
 
+import threading
+
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 
-from src.bot.trading_bot import TradingBot
+from src.bot.trading_bot import TradingBot, _fetch_income
 
 
 class TestTradingBot:
@@ -31,7 +33,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_test_all_connections_success(self, mock_db_class, mock_telegram_class, 
                                         mock_position_class, mock_sentiment_class,
                                         mock_twitter_class):
@@ -65,7 +67,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_test_all_connections_failure(self, mock_db_class, mock_telegram_class, 
                                         mock_position_class, mock_sentiment_class,
                                         mock_twitter_class):
@@ -99,7 +101,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_on_new_post_success(self, mock_db_class, mock_telegram_class, 
                                 mock_position_class, mock_sentiment_class,
                                 mock_twitter_class):
@@ -127,7 +129,8 @@ class TestTradingBot:
             "quantity": 0.1,
             "entry_price": 50000.0
         }
-        mock_position.execute_trade.return_value = True
+        mock_trade = Mock()
+        mock_position.execute_trade.return_value = {"trade_id": 1, "trade": mock_trade}
         mock_position_class.return_value = mock_position
         
         # Mock telegram
@@ -149,6 +152,7 @@ class TestTradingBot:
         }
         
         bot._on_new_post(post_data)
+        bot.flush_notifications()
         
         # Verify calls
         mock_telegram.notify_post_with_sentiment.assert_called_once()
@@ -156,12 +160,14 @@ class TestTradingBot:
         mock_position.should_trade.assert_called_once_with(8)
         mock_position.prepare_trade.assert_called_once_with(8)
         mock_position.execute_trade.assert_called_once()
+        # Position status reuses the new trade rather than re-querying it
+        mock_db.get_open_trade.assert_called_once()
 
     @patch('src.bot.trading_bot.TwitterMonitor')
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_on_new_post_no_trade(self, mock_db_class, mock_telegram_class, 
                                  mock_position_class, mock_sentiment_class,
                                  mock_twitter_class):
@@ -204,6 +210,7 @@ class TestTradingBot:
         }
         
         bot._on_new_post(post_data)
+        bot.flush_notifications()
         
         # Verify calls
         mock_telegram.notify_post_with_sentiment.assert_called_once()
@@ -217,7 +224,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_on_new_post_existing_position(self, mock_db_class, mock_telegram_class, 
                                           mock_position_class, mock_sentiment_class,
                                           mock_twitter_class):
@@ -259,6 +266,7 @@ class TestTradingBot:
         }
         
         bot._on_new_post(post_data)
+        bot.flush_notifications()
         
         # Verify calls
         mock_telegram.notify_post_with_sentiment.assert_called_once()
@@ -272,7 +280,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_on_new_post_error(self, mock_db_class, mock_telegram_class, 
                               mock_position_class, mock_sentiment_class,
                               mock_twitter_class):
@@ -315,7 +323,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_start_monitoring_success(self, mock_db_class, mock_telegram_class, 
                                      mock_position_class, mock_sentiment_class,
                                      mock_twitter_class):
@@ -347,7 +355,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_start_monitoring_failed_connections(self, mock_db_class, mock_telegram_class, 
                                                 mock_position_class, mock_sentiment_class,
                                                 mock_twitter_class):
@@ -379,7 +387,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_stop_monitoring(self, mock_db_class, mock_telegram_class, 
                             mock_position_class, mock_sentiment_class,
                             mock_twitter_class):
@@ -410,7 +418,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_get_status(self, mock_db_class, mock_telegram_class, 
                        mock_position_class, mock_sentiment_class,
                        mock_twitter_class):
@@ -468,7 +476,7 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
     def test_close_all_positions_success(self, mock_db_class, mock_telegram_class, 
                                         mock_position_class, mock_sentiment_class,
                                         mock_twitter_class):
@@ -492,7 +500,38 @@ class TestTradingBot:
     @patch('src.bot.trading_bot.SentimentAnalyzer')
     @patch('src.bot.trading_bot.PositionManager')
     @patch('src.bot.trading_bot.TelegramNotifier')
-    @patch('src.bot.trading_bot.DatabaseRepository')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_close_all_positions_notifies_before_returning(self, mock_db_class, mock_telegram_class,
+                                                           mock_position_class, mock_sentiment_class,
+                                                           mock_twitter_class):
+        """Test the close summary is sent before returning, since the CLI exits right after."""
+        mock_telegram = Mock()
+        mock_telegram_class.return_value = mock_telegram
+        
+        closed_trade = Mock(is_open=False, close_reason="MANUAL_CLOSE")
+        mock_db = Mock()
+        mock_db.get_trade_by_id.return_value = closed_trade
+        mock_db_class.return_value = mock_db
+        
+        mock_position = Mock()
+        mock_position.close_position.return_value = True
+        mock_position_class.return_value = mock_position
+        
+        bot = TradingBot()
+        bot._notify = Mock()
+        
+        with patch.object(bot, '_compute_trade_costs', return_value=(0.5, 0.0, "2024-01-01 12:00:00 UTC")):
+            success, _ = bot.close_all_positions()
+        
+        assert success is True
+        mock_telegram.notify_position_closed.assert_called_once()
+        bot._notify.assert_not_called()
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
     def test_close_all_positions_no_open_trade(self, mock_db_class, mock_telegram_class, 
                                               mock_position_class, mock_sentiment_class,
                                               mock_twitter_class):
@@ -515,4 +554,237 @@ class TestTradingBot:
         
         assert success is True
         assert error_msg == ""
-        mock_position.close_position.assert_not_called()
\ No newline at end of file
+        mock_position.close_position.assert_not_called()
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_cached_binance_reads(self, mock_db_class, mock_telegram_class,
+                                  mock_position_class, mock_sentiment_class,
+                                  mock_twitter_class):
+        """Test Binance reads are cached until the TTL expires or are invalidated."""
+        bot = TradingBot()
+        fetch = Mock(return_value={"total_balance": 100.0})
+        
+        assert bot._cached("account_balance", 60, fetch) == {"total_balance": 100.0}
+        assert bot._cached("account_balance", 60, fetch) == {"total_balance": 100.0}
+        assert fetch.call_count == 1
+        
+        bot._invalidate_cache()
+        bot._cached("account_balance", 60, fetch)
+        assert fetch.call_count == 2
+        
+        # Error results are not cached
+        failing = Mock(return_value={"error": "timeout"})
+        bot._cached("balance_error", 60, failing)
+        bot._cached("balance_error", 60, failing)
+        assert failing.call_count == 2
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_fetch_pnl_24h_single_request(self, mock_db_class, mock_telegram_class,
+                                          mock_position_class, mock_sentiment_class,
+                                          mock_twitter_class):
+        """Test 24h PnL is fetched in one income request and partitioned by type."""
+        mock_client = mock_position_class.return_value.binance.client
+        mock_client.futures_income_history.return_value = [
+            {"incomeType": "REALIZED_PNL", "income": "12.5", "time": 1},
+            {"incomeType": "COMMISSION", "income": "-0.5", "time": 2},
+            {"incomeType": "FUNDING_FEE", "income": "-1.0", "time": 3},
+            {"incomeType": "TRANSFER", "income": "500", "time": 4},
+        ]
+        
+        bot = TradingBot()
+        
+        assert bot._fetch_pnl_24h() == pytest.approx(11.0)
+        mock_client.futures_income_history.assert_called_once()
+        assert "incomeType" not in mock_client.futures_income_history.call_args[1]
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_run_forever_returns_when_stopped(self, mock_db_class, mock_telegram_class,
+                                              mock_position_class, mock_sentiment_class,
+                                              mock_twitter_class):
+        """Test run_forever blocks on the stop event rather than polling."""
+        bot = TradingBot()
+        
+        def fake_start():
+            bot.is_running = True
+            threading.Timer(0.05, bot.stop_monitoring).start()
+        
+        with patch.object(bot, 'start_monitoring', side_effect=fake_start), \
+                patch('src.bot.trading_bot.signal.signal'):
+            bot.run_forever()
+        
+        assert bot.is_running is False
+        assert bot._stop_event.is_set()
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_account_info_pnl_falls_back_to_database(self, mock_db_class, mock_telegram_class,
+                                                     mock_position_class, mock_sentiment_class,
+                                                     mock_twitter_class):
+        """Test 24h PnL falls back to the SQL aggregate when Binance fails."""
+        mock_db = mock_db_class.return_value
+        mock_db.get_open_trade.return_value = None
+        mock_db.get_total_trades_count.return_value = 3
+        mock_db.get_pnl_sum_last_24h.return_value = 42.5
+        
+        mock_binance = mock_position_class.return_value.binance
+        mock_binance.get_account_balance.return_value = {"total_balance": 100.0}
+        mock_binance.client.futures_income_history.side_effect = Exception("API down")
+        
+        bot = TradingBot()
+        info = bot._get_account_info()
+        
+        assert info["pnl_24h"] == 42.5
+        mock_db.get_pnl_sum_last_24h.assert_called_once()
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_compute_trade_costs_cached_per_trade(self, mock_db_class, mock_telegram_class,
+                                                  mock_position_class, mock_sentiment_class,
+                                                  mock_twitter_class):
+        """Test trade costs fall back to the fee estimate and are cached per trade."""
+        mock_binance = mock_position_class.return_value.binance
+        mock_binance.get_order_fees.return_value = 0.0
+        mock_binance.client.futures_income_history.return_value = [{"income": "-0.25"}]
+        
+        trade = Mock()
+        trade.id = 7
+        trade.entry_order_id = "123"
+        trade.notional_value = 1000.0
+        trade.opened_at = datetime(2024, 1, 1, 12, 0, 0)
+        trade.opened_at_ms = 1704110400000
+        
+        bot = TradingBot()
+        first = bot._compute_trade_costs(trade)
+        second = bot._compute_trade_costs(trade)
+        
+        assert first == second == (pytest.approx(0.5), -0.25, "2024-01-01 12:00:00 UTC")
+        mock_binance.get_order_fees.assert_called_once_with("123")
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_on_new_post_skips_duplicate(self, mock_db_class, mock_telegram_class,
+                                         mock_position_class, mock_sentiment_class,
+                                         mock_twitter_class):
+        """Test a re-delivered post is not analyzed twice."""
+        mock_sentiment = Mock()
+        mock_sentiment.process_post.return_value = None
+        
+        bot = TradingBot()
+        bot.sentiment_analyzer = mock_sentiment
+        
+        post_data = {
+            "post_id": 1,
+            "platform": "TWITTER",
+            "content": "Test post",
+            "external_id": "123",
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        
+        bot._on_new_post(post_data)
+        bot._on_new_post(dict(post_data))
+        
+        mock_sentiment.process_post.assert_called_once()
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_notifications_sent_in_order_by_worker(self, mock_db_class, mock_telegram_class,
+                                                   mock_position_class, mock_sentiment_class,
+                                                   mock_twitter_class):
+        """Test queued notifications run in order and a failure doesn't stop the worker."""
+        bot = TradingBot()
+        calls = []
+        
+        def failing():
+            raise RuntimeError("Telegram down")
+        
+        bot._notify(calls.append, "first")
+        bot._notify(failing)
+        bot._notify(calls.append, "second")
+        bot.flush_notifications()
+        
+        assert calls == ["first", "second"]
+        assert bot._notification_queue.unfinished_tasks == 0
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_flush_notifications_times_out(self, mock_db_class, mock_telegram_class,
+                                           mock_position_class, mock_sentiment_class,
+                                           mock_twitter_class):
+        """Test flushing gives up after the timeout while a send is still stuck."""
+        bot = TradingBot()
+        release = threading.Event()
+        
+        bot._notify(release.wait)
+        assert bot.flush_notifications(timeout=0.05) is False
+        
+        release.set()
+        assert bot.flush_notifications(timeout=5) is True
+
+    @patch('src.bot.trading_bot.TwitterMonitor')
+    @patch('src.bot.trading_bot.SentimentAnalyzer')
+    @patch('src.bot.trading_bot.PositionManager')
+    @patch('src.bot.trading_bot.TelegramNotifier')
+    @patch('src.bot.trading_bot.get_repository')
+    def test_on_new_post_without_sentiment_analyzer(self, mock_db_class, mock_telegram_class,
+                                                    mock_position_class, mock_sentiment_class,
+                                                    mock_twitter_class):
+        """Test posts are skipped cleanly when sentiment analysis is unavailable."""
+        mock_telegram = Mock()
+        mock_telegram_class.return_value = mock_telegram
+        
+        bot = TradingBot()
+        bot.sentiment_analyzer = None
+        
+        bot._on_new_post({"platform": "TWITTER", "external_id": "456", "content": "Test post"})
+        bot.flush_notifications()
+        
+        mock_telegram.notify_error.assert_not_called()
+        mock_position_class.return_value.execute_trade.assert_not_called()
+
+
+class TestFetchIncome:
+    """Test Binance income history pagination."""
+
+    def test_pages_until_short_page(self):
+        """Full pages advance the cursor past the last entry; a short page stops."""
+        client = Mock()
+        client.futures_income_history.side_effect = [
+            [{"income": "1", "time": 100}, {"income": "2", "time": 200}],
+            [{"income": "3", "time": 300}],
+        ]
+        
+        entries = list(_fetch_income(client, 0, 1000, "FUNDING_FEE", page_size=2))
+        
+        assert [e["income"] for e in entries] == ["1", "2", "3"]
+        assert client.futures_income_history.call_count == 2
+        second_call = client.futures_income_history.call_args_list[1][1]
+        assert second_call["startTime"] == 201
+        assert second_call["incomeType"] == "FUNDING_FEE"
+
@@ -1,12 +1,20 @@
 """Tests for social media monitors."""
 
+import json
+import threading
+
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime
 
+from src.monitors.scheduler import PollScheduler
+
 # Try to import Twitter monitor
 try:
-    from src.monitors.twitter_rapidapi import TwitterRapidAPI as TwitterMonitor
+    from src.monitors.twitter_rapidapi import (
+        TwitterRapidAPI as TwitterMonitor,
+        _iter_timeline_tweets,
+    )
     TWITTER_AVAILABLE = True
 except ImportError:
     TWITTER_AVAILABLE = False
@@ -21,6 +29,56 @@ except ImportError:
     TruthSocialMonitor = None
 
 
+class TestPollScheduler:
+    """Test the shared poll scheduler."""
+
+    def test_runs_callbacks_until_they_stop(self):
+        """Callbacks rerun after the delay they return and stop on None."""
+        scheduler = PollScheduler()
+        calls = []
+        finished = threading.Event()
+        
+        def poll():
+            calls.append("poll")
+            if len(calls) == 3:
+                finished.set()
+                return None
+            return 0.01
+        
+        scheduler.add(poll)
+        scheduler.start()
+        try:
+            assert finished.wait(timeout=2)
+        finally:
+            scheduler.stop()
+        
+        assert calls == ["poll", "poll", "poll"]
+
+    def test_runs_earliest_due_first(self):
+        """Callbacks run in order of their due time on one thread."""
+        scheduler = PollScheduler()
+        order = []
+        finished = threading.Event()
+        
+        def make(name):
+            def poll():
+                order.append((name, threading.current_thread().name))
+                if len(order) == 2:
+                    finished.set()
+                return None
+            return poll
+        
+        scheduler.add(make("late"), delay=0.05)
+        scheduler.add(make("early"))
+        scheduler.start()
+        try:
+            assert finished.wait(timeout=2)
+        finally:
+            scheduler.stop()
+        
+        assert order == [("early", "PollScheduler"), ("late", "PollScheduler")]
+
+
 class TestTwitterMonitor:
     """Test Twitter monitor functionality."""
 
@@ -32,9 +90,14 @@ class TestTwitterMonitor:
         assert monitor.api_host is not None
         assert monitor.db is not None
         assert monitor.is_monitoring is False
+        assert monitor.session.headers["X-RapidAPI-Host"] == monitor.api_host
+        
+        adapter = monitor.session.get_adapter(monitor.base_url)
+        assert adapter.max_retries.total == 3
+        assert 503 in adapter.max_retries.status_forcelist
 
     @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
-    @patch('src.monitors.twitter_rapidapi.requests.get')
+    @patch('src.monitors.base.requests.Session.get')
     def test_test_connection_success(self, mock_get):
         """Test successful connection test."""
         # Mock successful API response with proper structure
@@ -46,7 +109,7 @@ class TestTwitterMonitor:
             'x-ratelimit-requests-remaining': '450',
             'x-ratelimit-requests-reset': '3600'
         }
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "result": {
                 "data": {
                     "user": {
@@ -59,7 +122,7 @@ class TestTwitterMonitor:
                     }
                 }
             }
-        }
+        }).encode()
         mock_get.return_value = mock_response
         
         monitor = TwitterMonitor()
@@ -69,7 +132,7 @@ class TestTwitterMonitor:
         mock_get.assert_called_once()
 
     @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
-    @patch('src.monitors.twitter_rapidapi.requests.get')
+    @patch('src.monitors.base.requests.Session.get')
     def test_test_connection_failure(self, mock_get):
         """Test failed connection test."""
         # Mock failed API response
@@ -83,14 +146,14 @@ class TestTwitterMonitor:
         assert result is False
 
     @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
-    @patch('src.monitors.twitter_rapidapi.requests.get')
+    @patch('src.monitors.base.requests.Session.get')
     def test_get_recent_tweets(self, mock_get):
         """Test getting recent tweets."""
         # Mock successful API response
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = '{"result":{"timeline":...}}'
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "result": {
                 "timeline": {
                     "instructions": [
@@ -124,7 +187,7 @@ class TestTwitterMonitor:
                     ]
                 }
             }
-        }
+        }).encode()
         mock_get.return_value = mock_response
         
         monitor = TwitterMonitor()
@@ -134,9 +197,62 @@ class TestTwitterMonitor:
         assert tweets[0]["id"] == "123456789"
         assert tweets[0]["text"] == "Test tweet"
         assert tweets[0]["platform"] == "TWITTER"
+        
+        # Once the newest tweet has been seen, the timeline yields nothing new
+        assert monitor.get_recent_tweets(max_results=1, last_seen_id="123456789") == []
+
+    @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
+    @patch('src.monitors.base.requests.Session.get')
+    def test_get_recent_tweets_non_json_body(self, mock_get):
+        """Test a 200 response with a non-JSON body yields no tweets."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = "<html>Bad Gateway</html>"
+        mock_response.content = b"<html>Bad Gateway</html>"
+        mock_response.headers = {}
+        mock_get.return_value = mock_response
+        
+        monitor = TwitterMonitor()
+        
+        assert monitor.get_recent_tweets(max_results=1) == []
 
     @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
-    @patch('src.monitors.twitter_rapidapi.DatabaseRepository')
+    @patch('src.monitors.base.TelegramNotifier')
+    @patch('src.monitors.base.requests.Session.get')
+    def test_rate_limit_backoff(self, mock_get, mock_telegram_class):
+        """Test polling backs off after a 429 and resets after a success."""
+        # Mock rate-limited response
+        limited = Mock()
+        limited.status_code = 429
+        limited.text = "Too Many Requests"
+        limited.headers = {}
+        mock_get.return_value = limited
+        
+        monitor = TwitterMonitor()
+        assert monitor._next_poll_delay() == 30
+        
+        assert monitor.get_recent_tweets(max_results=1) == []
+        assert monitor._next_poll_delay() == 60
+        
+        monitor.get_recent_tweets(max_results=1)
+        assert monitor._next_poll_delay() == 120
+        
+        # One notifier is reused for every rate-limit alert
+        mock_telegram_class.assert_called_once()
+        assert mock_telegram_class.return_value.notify_error.call_count == 2
+        
+        # A successful response clears the backoff
+        ok = Mock()
+        ok.status_code = 200
+        ok.text = "{}"
+        ok.headers = {}
+        ok.content = json.dumps({}).encode()
+        mock_get.return_value = ok
+        monitor.get_recent_tweets(max_results=1)
+        assert monitor._next_poll_delay() == 30
+
+    @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
+    @patch('src.monitors.base.get_repository')
     def test_process_tweet_success(self, mock_db_class):
         """Test successful tweet processing."""
         # Mock database
@@ -166,7 +282,7 @@ class TestTwitterMonitor:
         mock_db.create_post.assert_called_once()
 
     @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
-    @patch('src.monitors.twitter_rapidapi.DatabaseRepository')
+    @patch('src.monitors.base.get_repository')
     def test_process_tweet_duplicate(self, mock_db_class):
         """Test processing duplicate tweet."""
         # Mock database
@@ -190,6 +306,95 @@ class TestTwitterMonitor:
         assert result is None
         mock_db.create_post.assert_not_called()
 
+    @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
+    def test_poll_once_processes_only_new_tweets(self):
+        """Test poll_once hands each new tweet to the callback once."""
+        on_new_post = Mock()
+        monitor = TwitterMonitor(on_new_post=on_new_post)
+        monitor.is_monitoring = True
+        tweet = {"id": "1", "text": "Test tweet"}
+        
+        with patch.object(monitor, 'get_recent_tweets', return_value=[tweet]) as mock_get, \
+             patch.object(monitor, 'process_item', return_value={"post_id": 1}) as mock_process:
+            # A new tweet halves the interval; a quiet poll stretches it by 15%
+            assert monitor.poll_once() == 15
+            assert monitor.poll_once() == pytest.approx(17.25)
+        
+        mock_process.assert_called_once_with(tweet)
+        on_new_post.assert_called_once_with({"post_id": 1})
+        assert mock_get.call_args.kwargs["last_seen_id"] == "1"
+        
+        monitor.is_monitoring = False
+        assert monitor.poll_once() is None
+
+    @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
+    def test_poll_interval_paced_by_low_quota(self):
+        """Test a nearly spent quota is spread over the time until reset."""
+        monitor = TwitterMonitor()
+        monitor.last_rate_limit = {"limit": "500", "remaining": "100", "reset": "3600"}
+        assert monitor._next_poll_delay() == 30
+        
+        monitor.last_rate_limit = {"limit": "500", "remaining": "10", "reset": "3600"}
+        assert monitor._next_poll_delay() == 360
+
+    @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
+    def test_iter_timeline_tweets_skips_non_tweets(self):
+        """Test only plain tweet results are yielded from the timeline."""
+        def item(typename, rest_id):
+            return {"content": {
+                "entryType": "TimelineTimelineItem",
+                "itemContent": {
+                    "itemType": "TimelineTweet",
+                    "tweet_results": {"result": {"__typename": typename, "rest_id": rest_id}},
+                },
+            }}
+        
+        data = {"result": {"timeline": {"instructions": [
+            {"type": "TimelineClearCache"},
+            {"type": "TimelineAddEntries", "entries": [
+                item("Tweet", "1"),
+                item("TweetTombstone", "2"),
+                {"content": {"entryType": "TimelineTimelineCursor"}},
+                {"content": None},
+                item("Tweet", "3"),
+            ]},
+        ]}}}
+        
+        assert [t["rest_id"] for t in _iter_timeline_tweets(data)] == ["1", "3"]
+        assert list(_iter_timeline_tweets({})) == []
+
+    @pytest.mark.skipif(not TWITTER_AVAILABLE, reason="Twitter monitor not available")
+    @patch('src.monitors.twitter_rapidapi._iter_timeline_tweets')
+    @patch('src.monitors.base.requests.Session.get')
+    def test_get_recent_tweets_stops_at_limit(self, mock_get, mock_iter):
+        """Test the timeline is not walked past the requested number of tweets."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = "{}"
+        mock_response.content = b"{}"
+        mock_response.headers = {}
+        mock_get.return_value = mock_response
+        
+        walked = []
+        
+        def timeline(data):
+            for rest_id in ("1", "2", "3"):
+                walked.append(rest_id)
+                yield {"rest_id": rest_id, "legacy": {"full_text": f"Tweet {rest_id}"}}
+        
+        mock_iter.side_effect = timeline
+        
+        monitor = TwitterMonitor()
+        tweets = monitor.get_recent_tweets(max_results=1)
+        
+        assert [t["id"] for t in tweets] == ["1"]
+        assert walked == ["1"]
+        
+        # A zero limit returns nothing without calling the API
+        mock_get.reset_mock()
+        assert monitor.get_recent_tweets(max_results=0) == []
+        mock_get.assert_not_called()
+
 
 class TestTruthSocialMonitor:
     """Test Truth Social monitor functionality."""
@@ -205,7 +410,7 @@ class TestTruthSocialMonitor:
         assert monitor.is_monitoring is False
 
     @pytest.mark.skipif(not TRUTH_SOCIAL_AVAILABLE, reason="Truth Social monitor not available")
-    @patch('src.monitors.truthsocial_rapidapi.requests.get')
+    @patch('src.monitors.base.requests.Session.get')
     def test_test_connection_success(self, mock_get):
         """Test successful connection test."""
         # Mock successful API response (Truth Social returns list directly)
@@ -217,13 +422,13 @@ class TestTruthSocialMonitor:
             'x-ratelimit-requests-remaining': '980',
             'x-ratelimit-requests-reset': '3600'
         }
-        mock_response.json.return_value = [
+        mock_response.content = json.dumps([
             {
                 "id": "115387504970821391",
                 "content": "<p>Test post</p>",
                 "created_at": "2025-10-17T03:59:58.840000Z"
             }
-        ]
+        ]).encode()
         mock_get.return_value = mock_response
         
         monitor = TruthSocialMonitor()
@@ -233,7 +438,7 @@ class TestTruthSocialMonitor:
         mock_get.assert_called_once()
 
     @pytest.mark.skipif(not TRUTH_SOCIAL_AVAILABLE, reason="Truth Social monitor not available")
-    @patch('src.monitors.truthsocial_rapidapi.requests.get')
+    @patch('src.monitors.base.requests.Session.get')
     def test_test_connection_failure(self, mock_get):
         """Test failed connection test."""
         # Mock failed API response
@@ -247,14 +452,14 @@ class TestTruthSocialMonitor:
         assert result is False
 
     @pytest.mark.skipif(not TRUTH_SOCIAL_AVAILABLE, reason="Truth Social monitor not available")
-    @patch('src.monitors.truthsocial_rapidapi.requests.get')
+    @patch('src.monitors.base.requests.Session.get')
     def test_test_connection_empty_list(self, mock_get):
         """Test connection with empty response list."""
         # Mock empty list response
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = '[]'
-        mock_response.json.return_value = []
+        mock_response.content = json.dumps([]).encode()
         mock_get.return_value = mock_response
         
         monitor = TruthSocialMonitor()
@@ -263,14 +468,14 @@ class TestTruthSocialMonitor:
         assert result is False
 
     @pytest.mark.skipif(not TRUTH_SOCIAL_AVAILABLE, reason="Truth Social monitor not available")
-    @patch('src.monitors.truthsocial_rapidapi.requests.get')
+    @patch('src.monitors.base.requests.Session.get')
     def test_get_recent_posts(self, mock_get):
         """Test getting recent posts from Truth Social."""
         # Mock successful API response (actual structure from Truth Social API)
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = '[{"id":"115387504970821391","content":"<p>Test post</p>"}]'
-        mock_response.json.return_value = [
+        mock_response.content = json.dumps([
             {
                 "id": "115387504970821391",
                 "created_at": "2025-10-17T03:59:58.840000Z",
@@ -279,7 +484,7 @@ class TestTruthSocialMonitor:
                 "favourites_count": 7176,
                 "replies_count": 1059
             }
-        ]
+        ]).encode()
         mock_get.return_value = mock_response
         
         monitor = TruthSocialMonitor()
@@ -293,7 +498,27 @@ class TestTruthSocialMonitor:
         assert posts[0]["public_metrics"]["like_count"] == 7176
 
     @pytest.mark.skipif(not TRUTH_SOCIAL_AVAILABLE, reason="Truth Social monitor not available")
-    @patch('src.monitors.truthsocial_rapidapi.DatabaseRepository')
+    @patch('src.monitors.base.TelegramNotifier')
+    @patch('src.monitors.base.requests.Session.get')
+    def test_rate_limit_backoff_waits_for_reset(self, mock_get, mock_telegram_class):
+        """Test backoff waits for the advertised reset, capped at the maximum."""
+        # Mock rate-limited response with a reset window
+        limited = Mock()
+        limited.status_code = 429
+        limited.text = "Too Many Requests"
+        limited.headers = {'x-ratelimit-requests-reset': '300'}
+        mock_get.return_value = limited
+        
+        monitor = TruthSocialMonitor()
+        assert monitor.get_recent_posts(max_results=1) == []
+        assert monitor._next_poll_delay() == 300
+        
+        limited.headers = {'x-ratelimit-requests-reset': '86400'}
+        monitor.get_recent_posts(max_results=1)
+        assert monitor._next_poll_delay() == 900
+
+    @pytest.mark.skipif(not TRUTH_SOCIAL_AVAILABLE, reason="Truth Social monitor not available")
+    @patch('src.monitors.base.get_repository')
     def test_process_post_success(self, mock_db_class):
         """Test successful post processing."""
         # Mock database
@@ -323,7 +548,7 @@ class TestTruthSocialMonitor:
         mock_db.create_post.assert_called_once()
 
     @pytest.mark.skipif(not TRUTH_SOCIAL_AVAILABLE, reason="Truth Social monitor not available")
-    @patch('src.monitors.truthsocial_rapidapi.DatabaseRepository')
+    @patch('src.monitors.base.get_repository')
     def test_process_post_duplicate(self, mock_db_class):
         """Test processing duplicate post."""
         # Mock database
@@ -348,14 +573,14 @@ class TestTruthSocialMonitor:
         mock_db.create_post.assert_not_called()
 
     @pytest.mark.skipif(not TRUTH_SOCIAL_AVAILABLE, reason="Truth Social monitor not available")
-    @patch('src.monitors.truthsocial_rapidapi.requests.get')
+    @patch('src.monitors.base.requests.Session.get')
     def test_html_stripping(self, mock_get):
         """Test that HTML tags are properly stripped from content."""
         # Mock response with complex HTML
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = '[{"id":"123",...}]'
-        mock_response.json.return_value = [
+        mock_response.content = json.dumps([
             {
                 "id": "123",
                 "created_at": "2025-10-17T03:59:58.840000Z",
@@ -364,7 +589,7 @@ class TestTruthSocialMonitor:
                 "favourites_count": 0,
                 "replies_count": 0
             }
-        ]
+        ]).encode()
         mock_get.return_value = mock_response
         
         monitor = TruthSocialMonitor()
@@ -1,9 +1,13 @@
 """Tests for notification system."""
 
+import json
+
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 
+from urllib3.exceptions import ReadTimeoutError
+
 from src.notifications.telegram_notifier import TelegramNotifier
 
 
@@ -17,7 +21,36 @@ class TestTelegramNotifier:
         assert notifier.channel_id is not None
         assert notifier.base_url is not None
 
-    @patch('src.notifications.telegram_notifier.requests.get')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
+    def test_send_message_reuses_session(self, mock_post):
+        """Test consecutive messages go through the same pooled session."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"ok": True}
+        mock_post.return_value = mock_response
+        
+        notifier = TelegramNotifier()
+        notifier.send_message("First")
+        notifier.send_message("Second")
+        
+        assert mock_post.call_count == 2
+        assert notifier._session.get_adapter(notifier.base_url).max_retries.total == 2
+
+    def test_retry_policy_does_not_resend_messages(self):
+        """Test POSTs are only retried on 429, while GETs also retry gateway errors."""
+        notifier = TelegramNotifier()
+        retry = notifier._session.get_adapter(notifier.base_url).max_retries
+        
+        assert retry.is_retry("POST", 429) is True
+        assert retry.is_retry("POST", 502) is False
+        assert retry.is_retry("POST", 504) is False
+        assert retry.is_retry("GET", 502) is True
+        
+        # A read timeout means the message may have gone out, so it is not retried
+        with pytest.raises(ReadTimeoutError):
+            retry.increment("POST", "/sendMessage", error=ReadTimeoutError(None, "/sendMessage", "timed out"))
+
+    @patch('src.notifications.telegram_notifier.requests.Session.get')
     def test_test_connection_success(self, mock_get):
         """Test successful connection test."""
         # Mock successful response
@@ -38,7 +71,7 @@ class TestTelegramNotifier:
         assert result is True
         mock_get.assert_called_once()
 
-    @patch('src.notifications.telegram_notifier.requests.get')
+    @patch('src.notifications.telegram_notifier.requests.Session.get')
     def test_test_connection_failure(self, mock_get):
         """Test failed connection test."""
         # Mock failed response
@@ -51,7 +84,7 @@ class TestTelegramNotifier:
         
         assert result is False
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_send_message_success(self, mock_post):
         """Test successful message sending."""
         # Mock successful response
@@ -66,7 +99,7 @@ class TestTelegramNotifier:
         assert result is True
         mock_post.assert_called_once()
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_send_message_failure(self, mock_post):
         """Test failed message sending."""
         # Mock failed response
@@ -80,7 +113,24 @@ class TestTelegramNotifier:
         
         assert result is False
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
+    def test_send_message_serializes_reply_markup(self, mock_post):
+        """Test dict keyboards are JSON-encoded and string keyboards sent as-is."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"ok": True}
+        mock_post.return_value = mock_response
+        
+        notifier = TelegramNotifier()
+        keyboard = {"inline_keyboard": [[{"text": "🏠 Main Menu", "callback_data": "get_main_menu"}]]}
+        notifier.send_message("Dict", reply_markup=keyboard)
+        notifier.send_message("String", reply_markup='{"inline_keyboard":[]}')
+        
+        first, second = (json.loads(call[1]["data"])["reply_markup"] for call in mock_post.call_args_list)
+        assert json.loads(first) == keyboard
+        assert second == '{"inline_keyboard":[]}'
+
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_new_post(self, mock_post):
         """Test notifying about new post."""
         # Mock successful response
@@ -104,11 +154,11 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         assert "NEW TWITTER POST" in message_data["text"]
         assert "Test post content" in message_data["text"]
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_sentiment_analysis_bullish(self, mock_post):
         """Test notifying about bullish sentiment analysis."""
         # Mock successful response
@@ -133,12 +183,12 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         assert "SENTIMENT ANALYSIS COMPLETE" in message_data["text"]
         assert "BULLISH (8/10)" in message_data["text"]
         assert "Very bullish sentiment" in message_data["text"]
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_sentiment_analysis_bearish(self, mock_post):
         """Test notifying about bearish sentiment analysis."""
         # Mock successful response
@@ -163,12 +213,12 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         assert "SENTIMENT ANALYSIS COMPLETE" in message_data["text"]
         assert "BEARISH (2/10)" in message_data["text"]
         assert "Very bearish sentiment" in message_data["text"]
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_sentiment_analysis_neutral(self, mock_post):
         """Test notifying about neutral sentiment analysis."""
         # Mock successful response
@@ -193,12 +243,12 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         assert "SENTIMENT ANALYSIS COMPLETE" in message_data["text"]
         assert "NEUTRAL (5/10)" in message_data["text"]
         assert "Neutral sentiment" in message_data["text"]
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_trade_execution_dry_run(self, mock_post):
         """Test notifying about trade execution in dry run mode."""
         # Mock successful response
@@ -225,12 +275,12 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         assert "DRY RUN: TRADE EXECUTED" in message_data["text"]
         assert "LONG 10x" in message_data["text"]
         assert "SIMULATED TRADE" in message_data["text"]
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_trade_execution_live(self, mock_post):
         """Test notifying about trade execution in live mode."""
         # Mock successful response
@@ -258,12 +308,12 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         assert "TRADE EXECUTED" in message_data["text"]
         assert "SHORT 30x" in message_data["text"]
         assert "RISK MANAGEMENT" in message_data["text"]
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_position_update_profit(self, mock_post):
         """Test notifying about position update with profit."""
         # Mock successful response
@@ -288,11 +338,11 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         assert "POSITION UPDATE" in message_data["text"]
         assert "PnL:</b> +2.00%" in message_data["text"]
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_position_update_loss(self, mock_post):
         """Test notifying about position update with loss."""
         # Mock successful response
@@ -317,11 +367,11 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         assert "POSITION UPDATE" in message_data["text"]
         assert "PnL:</b> -2.00%" in message_data["text"]
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_position_closed_profit(self, mock_post):
         """Test notifying about position closure with profit."""
         # Mock successful response
@@ -349,12 +399,12 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         # Check for correct ROI percentage (based on margin, not notional)
         # With $100 PnL on $500 margin = 20% ROI
         assert ("+20.00%" in message_data["text"] or "LEGEND" in message_data["text"] or "BEAST" in message_data["text"])
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_position_closed_loss(self, mock_post):
         """Test notifying about position closure with loss."""
         # Mock successful response
@@ -382,12 +432,12 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         # Check for correct ROI percentage (based on margin, not notional)
         # With -$100 PnL on $500 margin = -20% ROI
         assert ("-20.00%" in message_data["text"] or "CLOWN" in message_data["text"] or "HAHAHAHA" in message_data["text"])
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_notify_error(self, mock_post):
         """Test notifying about errors."""
         # Mock successful response
@@ -411,12 +461,12 @@ class TestTelegramNotifier:
         
         # Check message content
         call_args = mock_post.call_args
-        message_data = call_args[1]["json"]
+        message_data = json.loads(call_args[1]["data"])
         assert "ERROR ALERT" in message_data["text"]
         assert "API Error" in message_data["text"]
         assert "Connection failed" in message_data["text"]
 
-    @patch('src.notifications.telegram_notifier.requests.post')
+    @patch('src.notifications.telegram_notifier.requests.Session.post')
     def test_send_test_message(self, mock_post):
         """Test sending test message."""
         # Mock successful response
@@ -428,8 +478,8 @@ class TestTelegramNotifier:
         notifier = TelegramNotifier()
         
         # Mock settings for dry run mode
-        with patch('src.notifications.telegram_notifier.settings') as mock_settings:
-            mock_settings.binance_testnet = True
+        with patch('src.notifications.telegram_notifier.get_settings') as mock_get_settings:
+            mock_get_settings.return_value.binance_testnet = True
             
             result = notifier.send_test_message()
             
@@ -438,7 +488,7 @@ class TestTelegramNotifier:
             
             # Check message content
             call_args = mock_post.call_args
-            message_data = call_args[1]["json"]
+            message_data = json.loads(call_args[1]["data"])
             assert "TRUMP TRADER BOT" in message_data["text"]
             assert "Status:</b> Online and ready" in message_data["text"]
             assert "Mode:</b> TESTNET" in message_data["text"]
@@ -2,8 +2,10 @@
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from datetime import datetime, timezone
 from decimal import Decimal
 
+from src.database.models import Trade
 from src.trading.binance_client import BinanceClient
 from src.trading.position_manager import PositionManager
 
@@ -414,8 +416,8 @@ class TestPositionManager:
         manager.db = mock_db
         
         # Mock settings for dry run
-        with patch('src.trading.position_manager.settings') as mock_settings:
-            mock_settings.binance_testnet = True
+        with patch('src.trading.position_manager.get_settings') as mock_get_settings:
+            mock_get_settings.return_value.binance_testnet = True
             
             trade_params = {
                 "side": "BUY",
@@ -460,8 +462,8 @@ class TestPositionManager:
         manager.db = mock_db
         
         # Mock settings for live mode
-        with patch('src.trading.position_manager.settings') as mock_settings:
-            mock_settings.binance_testnet = False
+        with patch('src.trading.position_manager.get_settings') as mock_get_settings:
+            mock_get_settings.return_value.binance_testnet = False
             
             trade_params = {
                 "side": "LONG",  # Use LONG/SHORT as expected by execute_trade
@@ -509,3 +511,17 @@ class TestPositionManager:
         assert "open_trade" in status
         assert "testnet_mode" in status
         assert status["open_trade"] is None
+
+
+class TestTradeModel:
+    """Test Trade model helpers."""
+
+    def test_opened_at_ms_treats_naive_as_utc(self):
+        """Naive and aware UTC timestamps give the same epoch milliseconds."""
+        naive = Trade(opened_at=datetime(2024, 1, 1, 12, 0, 0))
+        aware = Trade(opened_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc))
+        assert naive.opened_at_ms == aware.opened_at_ms == 1704110400000
+
+    def test_opened_at_ms_none(self):
+        """Unset opening time gives None."""
+        assert Trade().opened_at_ms is None
@@ -1,14 +1,18 @@
 """Atomic tests for utility functions."""
 
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
 from src.utils.helpers import (
     calculate_pnl_percentage,
     format_currency,
+    format_utc_timestamp,
     get_callback_rate_for_leverage,
     get_leverage_for_score,
     get_position_side,
     hash_content,
+    parse_twitter_timestamp,
     should_open_position,
 )
 
@@ -56,6 +60,34 @@ class TestFormatCurrency:
         assert format_currency(-1234.56) == "$-1,234.56"
 
 
+class TestFormatUtcTimestamp:
+    """Test UTC timestamp formatting."""
+
+    def test_format_aware_timestamp(self):
+        """Aware timestamps are converted to UTC and truncated to seconds."""
+        dt = datetime(2024, 1, 2, 5, 4, 5, 123456, tzinfo=timezone(timedelta(hours=2)))
+        assert format_utc_timestamp(dt) == "2024-01-02 03:04:05 UTC"
+
+    def test_format_naive_timestamp(self):
+        """Naive timestamps are treated as UTC."""
+        dt = datetime(2024, 1, 2, 3, 4, 5)
+        assert format_utc_timestamp(dt) == dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+class TestParseTwitterTimestamp:
+    """Test Twitter created_at parsing."""
+
+    def test_matches_strptime(self):
+        """The fast path agrees with strptime, including non-UTC offsets."""
+        for value in ("Tue Oct 14 17:20:04 +0000 2025", "Sat Mar 02 09:05:00 +0000 2024", "Tue Oct 14 17:20:04 +0200 2025"):
+            assert parse_twitter_timestamp(value) == datetime.strptime(value, "%a %b %d %H:%M:%S %z %Y")
+
+    def test_invalid_timestamp_raises(self):
+        """Unparseable input raises ValueError."""
+        with pytest.raises(ValueError):
+            parse_twitter_timestamp("not a timestamp")
+
+
 class TestCalculatePnlPercentage:
     """Test PnL percentage calculation."""
 